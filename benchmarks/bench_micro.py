@@ -0,0 +1,78 @@
+"""
+Micro-benchmarks for the CPU-bound parts of the request path: SIMBAD response
+parsing, star enrichment and mythology formatting.
+
+    python -m benchmarks.bench_micro
+"""
+
+import argparse
+import os
+import timeit
+
+from benchmarks.fakes import MYTHOLOGY_COMPLETION, load_simbad_recorded
+from benchmarks.results import write_results
+
+
+def measure(func, number: int, repeat: int) -> dict:
+    """Best-of-`repeat` time per call, in microseconds."""
+    timings = timeit.repeat(func, number=number, repeat=repeat)
+    return {
+        "best_us": round(min(timings) / number * 1e6, 3),
+        "median_us": round(sorted(timings)[len(timings) // 2] / number * 1e6, 3),
+        "calls": number,
+    }
+
+
+def run(number: int, repeat: int) -> dict:
+    os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+    from src.backend.services.ai_star_info import format_mythology_response
+    from src.backend.services.simbad_api import (
+        enrich_star_data,
+        parse_simbad_response,
+        parse_spectral_type,
+    )
+
+    responses = list(load_simbad_recorded().values())
+    parsed = [parse_simbad_response(text) for text in responses]
+    spectral_types = [p["spectral_type"] for p in parsed]
+    completion = MYTHOLOGY_COMPLETION.format(star="Antares").replace("\n-", "")
+
+    return {
+        "parse_simbad_response": measure(
+            lambda: [parse_simbad_response(text) for text in responses],
+            number,
+            repeat,
+        ),
+        "parse_spectral_type": measure(
+            lambda: [parse_spectral_type(s) for s in spectral_types], number, repeat
+        ),
+        "enrich_star_data": measure(
+            lambda: [enrich_star_data(p) for p in parsed], number, repeat
+        ),
+        "format_mythology_response": measure(
+            lambda: format_mythology_response(completion), number, repeat
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.number, args.repeat)
+    path = write_results(
+        "micro", results, {"number": args.number, "repeat": args.repeat}, args.output
+    )
+    for name, stats in results.items():
+        print(
+            f"{name:<28} best={stats['best_us']:>9.2f}us  median={stats['median_us']:>9.2f}us"
+        )
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
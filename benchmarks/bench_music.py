@@ -0,0 +1,144 @@
+"""
+Mood-to-music benchmark: ingests a synthetic catalog from the local Spotify
+stub into the audio-feature index, compares batched and per-star
+nearest-neighbour lookups, then drives `/star_music/` with cold and warm caches.
+
+    python -m benchmarks.bench_music --tracks 20000 --requests 50
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.fakes import (
+    FakeRedis,
+    StubServer,
+    load_simbad_recorded,
+    simbad_stub,
+    spotify_stub,
+    synthetic_tracks,
+)
+from benchmarks.results import summarize, write_results
+
+
+async def run(args) -> dict:
+    spotify = StubServer(
+        spotify_stub(
+            synthetic_tracks(args.tracks),
+            playlists=args.playlists,
+            latency=args.spotify_latency,
+        )
+    )
+    simbad = StubServer(simbad_stub())
+    spotify_url = await spotify.start()
+    simbad_url = await simbad.start()
+    tmpdir = tempfile.mkdtemp(prefix="antares-bench-")
+
+    # The app reads these at import time, so set them before importing it
+    os.environ["SPOTIFY_API_URL"] = f"{spotify_url}/v1"
+    os.environ["SPOTIFY_TOKEN_URL"] = f"{spotify_url}/api/token"
+    os.environ["MUSIC_INDEX_PATH"] = os.path.join(tmpdir, "music_index.npz")
+    os.environ["SIMBAD_SCRIPT_URL"] = f"{simbad_url}/simbad/sim-script"
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmpdir}/bench.db"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    import httpx
+    import numpy as np
+    from src.backend.core.services import services
+    from src.backend.main import app
+    from src.backend.models.star import Base
+    from src.backend.services.music_index import MusicIndex, music_index_store
+    from src.backend.services.redis_client import redis_client
+    from src.backend.services.spotify_api import fetch_tracks_with_features
+
+    fake_redis = FakeRedis()
+    redis_client.redis = fake_redis
+    async with services.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    results = {}
+    try:
+        # Ingestion: playlists + audio features over HTTP, then build and save
+        start = time.perf_counter()
+        tracks = await fetch_tracks_with_features(
+            [f"playlist{i}" for i in range(args.playlists)]
+        )
+        music_index_store.replace(MusicIndex.from_tracks(tracks))
+        elapsed = time.perf_counter() - start
+        results["ingest"] = summarize([elapsed], elapsed)
+
+        # Lookups: one batched query vs one query per star
+        index = await music_index_store.get()
+        targets = np.random.default_rng(0).random((args.batch, 4), dtype=np.float32)
+        for name, query in (
+            ("nearest_batched", lambda: index.nearest(targets, 20)),
+            ("nearest_looped", lambda: [index.nearest(t, 20) for t in targets]),
+        ):
+            latencies = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                query()
+                latencies.append(time.perf_counter() - start)
+            results[name] = summarize(latencies, sum(latencies))
+
+        star_names = list(load_simbad_recorded())
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        ) as client:
+            for scenario, flush in (
+                ("star_music_cold", True),
+                ("star_music_warm", False),
+            ):
+                latencies, errors = [], 0
+                if not flush:
+                    await client.get("/star_music/", params={"star_name": star_names})
+                wall = time.perf_counter()
+                for _ in range(args.requests):
+                    if flush:
+                        await fake_redis.flushall()
+                    start = time.perf_counter()
+                    response = await client.get(
+                        "/star_music/",
+                        params={"star_name": star_names, "emotion": ["calm"]},
+                    )
+                    latencies.append(time.perf_counter() - start)
+                    errors += response.status_code != 200
+                results[scenario] = summarize(
+                    latencies, time.perf_counter() - wall, errors
+                )
+    finally:
+        await spotify.stop()
+        await simbad.stop()
+        await services.aclose()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tracks", type=int, default=20000)
+    parser.add_argument("--playlists", type=int, default=4)
+    parser.add_argument("--spotify-latency", type=float, default=0.02)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    params = {k: v for k, v in vars(args).items() if k != "output"}
+    path = write_results("music", results, params, args.output)
+
+    for scenario, stats in results.items():
+        print(
+            f"{scenario:<16} p50={stats['p50_ms']:>9.2f}ms  p95={stats['p95_ms']:>9.2f}ms"
+            f"  p99={stats['p99_ms']:>9.2f}ms  errors={stats['errors']}"
+        )
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+End-to-end `/star_info/` benchmark: boots the FastAPI app in-process against the
+local SIMBAD/OpenAI stubs, an in-memory Redis and SQLite (or a local Postgres via
+--database-url), then drives cold-cache, warm-cache and burst scenarios.
+
+    python -m benchmarks.bench_star_info --requests 200 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.fakes import (
+    FakeRedis,
+    StubServer,
+    load_simbad_recorded,
+    openai_stub,
+    simbad_stub,
+)
+from benchmarks.results import summarize, write_results
+
+
+async def drive(client, star_names: list[str], concurrency: int, before=None):
+    """
+    Requests `/star_info/` for every name with at most `concurrency` in flight.
+
+    Returns:
+        tuple: (latencies in seconds, error count, wall time in seconds)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(star_name: str):
+        nonlocal errors
+        async with semaphore:
+            if before:
+                await before()
+            start = time.perf_counter()
+            response = await client.get("/star_info/", params={"star_name": star_name})
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(name) for name in star_names))
+    return latencies, errors, time.perf_counter() - start
+
+
+async def reset_state(redis, engine, metadata):
+    """Empties Redis and every table, so the next request reaches SIMBAD and OpenAI."""
+    await redis.flushall()
+    async with engine.begin() as conn:
+        for table in reversed(metadata.sorted_tables):
+            await conn.execute(table.delete())
+
+
+async def run(args) -> dict:
+    simbad = StubServer(simbad_stub(latency=args.simbad_latency))
+    openai_server = StubServer(
+        openai_stub(latency=args.openai_latency, chunk_delay=args.openai_chunk_delay)
+    )
+    simbad_url = await simbad.start()
+    openai_url = await openai_server.start()
+    tmpdir = tempfile.mkdtemp(prefix="antares-bench-")
+
+    # The app reads these at import time, so set them before importing it
+    os.environ["SIMBAD_SCRIPT_URL"] = f"{simbad_url}/simbad/sim-script"
+    os.environ["OPENAI_BASE_URL"] = f"{openai_url}/v1"
+    os.environ["OPENAI_API_KEY"] = "bench"
+    os.environ["DATABASE_URL"] = (
+        args.database_url or f"sqlite+aiosqlite:///{tmpdir}/bench.db"
+    )
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    import httpx
+    from src.backend.core.services import services
+    from src.backend.main import app
+    from src.backend.models.star import Base
+    from src.backend.services.redis_client import redis_client
+
+    fake_redis = FakeRedis()
+    redis_client.redis = fake_redis
+    async with services.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    star_names = list(load_simbad_recorded())
+    names = [star_names[i % len(star_names)] for i in range(args.requests)]
+    results = {}
+
+    async def reset():
+        await reset_state(fake_redis, services.engine, Base.metadata)
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        ) as client:
+            # Cold cache: Redis and the database are emptied before every request,
+            # so each one goes to SIMBAD + OpenAI
+            latencies, errors, wall = await drive(
+                client, names[: args.cold_requests], 1, before=reset
+            )
+            results["cold_cache"] = summarize(latencies, wall, errors)
+
+            # Warm cache: prime once, then every request is served from Redis
+            await drive(client, star_names, args.concurrency)
+            latencies, errors, wall = await drive(client, names, args.concurrency)
+            results["warm_cache"] = summarize(latencies, wall, errors)
+
+            # Burst: all requests at once against an empty cache and database
+            await reset()
+            latencies, errors, wall = await drive(client, names, len(names))
+            results["burst_cold"] = summarize(latencies, wall, errors)
+    finally:
+        await simbad.stop()
+        await openai_server.stop()
+        await services.aclose()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--cold-requests", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--simbad-latency", type=float, default=0.05)
+    parser.add_argument("--openai-latency", type=float, default=0.2)
+    parser.add_argument("--openai-chunk-delay", type=float, default=0.0)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    params = {
+        k: v for k, v in vars(args).items() if k not in ("output", "database_url")
+    }
+    params["database"] = "external" if args.database_url else "sqlite"
+    path = write_results("star_info", results, params, args.output)
+
+    for scenario, stats in results.items():
+        print(
+            f"{scenario:<12} p50={stats['p50_ms']:>9.2f}ms  p95={stats['p95_ms']:>9.2f}ms"
+            f"  p99={stats['p99_ms']:>9.2f}ms  {stats['throughput_rps']:>9.1f} req/s"
+            f"  errors={stats['errors']}"
+        )
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
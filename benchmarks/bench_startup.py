@@ -0,0 +1,133 @@
+"""
+Startup benchmark: imports the app in fresh interpreters and fails when the
+median import time exceeds a budget or when service client libraries are
+imported eagerly again.
+
+    python -m benchmarks.bench_startup --runs 10 --budget-ms 1200
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.results import summarize, write_results
+
+# Run in each child interpreter; prints the import time and loaded modules
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import src.backend.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"import_s": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+# Built on first use (see src/backend/core/services.py) or never used by the API
+LAZY_MODULES = ("openai", "aiohttp", "httpx", "pandas", "astroquery")
+
+
+def _run_child(env: dict, importtime: bool = False) -> tuple[dict, float, str]:
+    """Imports the app in a new interpreter; returns (report, wall time, stderr)."""
+    command = [sys.executable, *(["-X", "importtime"] if importtime else [])]
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [*command, "-c", CHILD], env=env, capture_output=True, text=True, check=True
+    )
+    wall = time.perf_counter() - start
+    return json.loads(completed.stdout.strip().splitlines()[-1]), wall, completed.stderr
+
+
+def import_profile(stderr: str, top: int = 10) -> dict[str, float]:
+    """Self time (ms) per top-level package from `-X importtime` output."""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0.0) + int(self_us) / 1000
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return {package: round(ms, 2) for package, ms in ranked[:top]}
+
+
+def run(args) -> tuple[dict, list[str]]:
+    env = {
+        **os.environ,
+        "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+        "LOG_LEVEL": "WARNING",
+    }
+    # Discarded: compiles bytecode so every measured run starts equally cold
+    _run_child(env)
+
+    imports, walls, eager = [], [], set()
+    for _ in range(args.runs):
+        report, wall, _ = _run_child(env)
+        imports.append(report["import_s"])
+        walls.append(wall)
+        eager.update(
+            name for name in report["modules"] if name.split(".")[0] in args.forbid
+        )
+    _, _, stderr = _run_child(env, importtime=True)
+
+    results = {
+        "import": summarize(imports, sum(imports)),
+        "cold_start": summarize(walls, sum(walls)),
+        "import_profile_ms": import_profile(stderr),
+    }
+
+    failures = []
+    if results["import"]["p50_ms"] > args.budget_ms:
+        failures.append(
+            f"median import {results['import']['p50_ms']:.0f}ms exceeds the "
+            f"{args.budget_ms:.0f}ms budget"
+        )
+    eager_packages = sorted({name.split(".")[0] for name in eager})
+    if eager_packages:
+        failures.append(f"imported at startup: {', '.join(eager_packages)}")
+    return results, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("STARTUP_BUDGET_MS", "1200")),
+        help="Maximum median import time of src.backend.main",
+    )
+    parser.add_argument(
+        "--forbid",
+        type=lambda value: [name for name in value.split(",") if name],
+        default=list(LAZY_MODULES),
+        help="Comma-separated packages that must not be imported with the app",
+    )
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results, failures = run(args)
+    params = {k: v for k, v in vars(args).items() if k != "output"}
+    path = write_results("startup", results, params, args.output)
+
+    for scenario in ("import", "cold_start"):
+        stats = results[scenario]
+        print(
+            f"{scenario:<12} p50={stats['p50_ms']:>9.2f}ms  p95={stats['p95_ms']:>9.2f}ms"
+            f"  max={stats['max_ms']:>9.2f}ms"
+        )
+    print(
+        "slowest packages: "
+        + ", ".join(f"{k} {v:.0f}ms" for k, v in results["import_profile_ms"].items())
+    )
+    print(f"Results written to {path}")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
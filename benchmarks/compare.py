@@ -0,0 +1,68 @@
+"""
+Compares two benchmark result files and flags regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json --fail-over 10
+"""
+
+import argparse
+import json
+import sys
+
+# Metrics where a higher value is better; everything else is a latency
+HIGHER_IS_BETTER = {"throughput_rps"}
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "best_us")
+
+
+def compare(baseline: dict, candidate: dict) -> list[tuple]:
+    """
+    Returns (case, metric, baseline, candidate, change %) rows, where a positive
+    change % always means "worse".
+    """
+    rows = []
+    for case, stats in candidate["results"].items():
+        base_stats = baseline["results"].get(case)
+        if not base_stats:
+            continue
+        for metric in COMPARED_METRICS:
+            if metric not in stats or metric not in base_stats:
+                continue
+            old, new = base_stats[metric], stats[metric]
+            if not old:
+                continue
+            change = (new - old) / old * 100
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            rows.append((case, metric, old, new, change))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--fail-over",
+        type=float,
+        default=None,
+        help="Exit non-zero if any metric regresses by more than this percentage.",
+    )
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    regressions = 0
+    for case, metric, old, new, change in compare(baseline, candidate):
+        flag = ""
+        if args.fail_over is not None and change > args.fail_over:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{case:<28} {metric:<15} {old:>10} -> {new:>10}  {change:+7.1f}%{flag}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
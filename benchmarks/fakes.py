@@ -0,0 +1,405 @@
+"""
+Local stand-ins for the upstream services used by the backend:
+an in-memory Redis, a SIMBAD sim-script stub serving recorded responses, an
+OpenAI-compatible chat completions stub with configurable latency/streaming and
+a Spotify Web API stub serving a synthetic track catalog.
+"""
+
+import asyncio
+import fnmatch
+import json
+import os
+import random
+import re
+import time
+
+from aiohttp import web
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+SIMBAD_RECORDED = os.path.join(DATA_DIR, "simbad_recorded.json")
+
+SIMBAD_NOT_FOUND = (
+    "::error::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::\n\n"
+    "[3] Identifier not found in the database\n"
+)
+
+MYTHOLOGY_COMPLETION = (
+    "**Mythological Meaning**: {star} has guided travellers and storytellers "
+    "across many cultures.\n"
+    "- **Emotional and Symbolic Representation**: Steadiness, longing and quiet "
+    "resilience.\n"
+    "- **If the Star Were a Person**: A calm, attentive listener who speaks rarely "
+    "but with weight.\n"
+    "- **Message for the User**: Even the brightest light began in darkness; "
+    "keep burning."
+)
+
+
+class FakeRedis:
+    """In-memory subset of the aioredis API used by RedisClient."""
+
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+
+    def _alive(self, key: str) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            return False
+        return key in self._data
+
+    async def get(self, key: str):
+        return self._data[key] if self._alive(key) else None
+
+    async def set(self, key: str, value, ex: int | None = None):
+        self._data[key] = value
+        if ex:
+            self._expires[key] = time.monotonic() + ex
+        else:
+            self._expires.pop(key, None)
+        return True
+
+    async def mget(self, keys: list[str]) -> list:
+        return [await self.get(key) for key in keys]
+
+    async def setex(self, key: str, ttl: int, value):
+        return await self.set(key, value, ex=ttl)
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            removed += self._data.pop(key, None) is not None
+            self._expires.pop(key, None)
+        return removed
+
+    async def exists(self, key: str) -> int:
+        return int(self._alive(key))
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        if not self._alive(key):
+            return False
+        self._expires[key] = time.monotonic() + ttl
+        return True
+
+    async def ttl(self, key: str) -> int:
+        if not self._alive(key):
+            return -2
+        expires_at = self._expires.get(key)
+        return -1 if expires_at is None else int(expires_at - time.monotonic())
+
+    async def keys(self, pattern: str = "*") -> list[str]:
+        return [
+            k
+            for k in list(self._data)
+            if self._alive(k) and fnmatch.fnmatch(k, pattern)
+        ]
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        fields = self._data.setdefault(key, {})
+        fields[field] = int(fields.get(field, 0)) + amount
+        return fields[field]
+
+    async def hincrbyfloat(self, key: str, field: str, amount: float = 1.0) -> float:
+        fields = self._data.setdefault(key, {})
+        value = float(fields.get(field, 0)) + amount
+        fields[field] = repr(value)
+        return value
+
+    async def hgetall(self, key: str) -> dict:
+        return dict(self._data[key]) if self._alive(key) else {}
+
+    async def hmget(self, key: str, fields: list[str]) -> list:
+        existing = self._data[key] if self._alive(key) else {}
+        return [existing.get(field) for field in fields]
+
+    async def hset(self, key: str, field=None, value=None, mapping=None) -> int:
+        fields = self._data.setdefault(key, {})
+        updates = dict(mapping or {})
+        if field is not None:
+            updates[field] = value
+        added = sum(name not in fields for name in updates)
+        # Redis stores field values as strings
+        fields.update({name: str(value) for name, value in updates.items()})
+        return added
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        existing = self._data.get(key, {})
+        return sum(existing.pop(field, None) is not None for field in fields)
+
+    async def zadd(self, key: str, mapping: dict) -> int:
+        members = self._data.setdefault(key, {})
+        added = sum(name not in members for name in mapping)
+        members.update({name: float(score) for name, score in mapping.items()})
+        return added
+
+    async def zincrby(self, key: str, amount: float, member: str) -> float:
+        members = self._data.setdefault(key, {})
+        members[member] = float(members.get(member, 0)) + amount
+        return members[member]
+
+    async def zremrangebyscore(self, key: str, low, high) -> int:
+        low, high = float(low), float(high)
+        doomed = [name for name, score in self._ranked(key) if low <= score <= high]
+        return await self.zrem(key, *doomed) if doomed else 0
+
+    async def zscore(self, key: str, member: str):
+        return self._data.get(key, {}).get(member) if self._alive(key) else None
+
+    async def zrem(self, key: str, *members: str) -> int:
+        existing = self._data.get(key, {})
+        return sum(existing.pop(member, None) is not None for member in members)
+
+    def _ranked(self, key: str) -> list[tuple[str, float]]:
+        members = self._data.get(key, {}) if self._alive(key) else {}
+        return sorted(members.items(), key=lambda item: (item[1], item[0]))
+
+    @staticmethod
+    def _slice(items: list, start: int, end: int) -> list:
+        end = len(items) + end if end < 0 else end
+        return items[start : end + 1] if end >= 0 else []
+
+    async def zrange(self, key: str, start: int, end: int, withscores: bool = False):
+        items = self._slice(self._ranked(key), start, end)
+        return items if withscores else [name for name, _ in items]
+
+    async def zrevrange(self, key: str, start: int, end: int, withscores: bool = False):
+        items = self._slice(self._ranked(key)[::-1], start, end)
+        return items if withscores else [name for name, _ in items]
+
+    async def zremrangebyrank(self, key: str, start: int, end: int) -> int:
+        doomed = self._slice(self._ranked(key), start, end)
+        return await self.zrem(key, *(name for name, _ in doomed)) if doomed else 0
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    async def flushall(self):
+        self._data.clear()
+        self._expires.clear()
+
+    async def close(self):
+        pass
+
+
+class FakePipeline:
+    """Queues FakeRedis calls and runs them in order on execute()."""
+
+    def __init__(self, redis: FakeRedis):
+        self._redis = redis
+        self._calls = []
+
+    def __getattr__(self, name: str):
+        method = getattr(self._redis, name)
+
+        def queue(*args, **kwargs):
+            self._calls.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> list:
+        calls, self._calls = self._calls, []
+        return [await method(*args, **kwargs) for method, args, kwargs in calls]
+
+
+def load_simbad_recorded() -> dict[str, str]:
+    with open(SIMBAD_RECORDED, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class StubServer:
+    """Runs an aiohttp application on a free localhost port inside the current loop."""
+
+    def __init__(self, app: web.Application):
+        self.app = app
+        self._runner = None
+        self.url = None
+
+    async def start(self) -> str:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+
+def simbad_stub(latency: float = 0.0, responses: dict[str, str] | None = None):
+    """
+    SIMBAD sim-script stand-in. Answers `query id <name>` scripts from recorded
+    responses; unknown identifiers get SIMBAD's error block.
+    """
+    recorded = responses if responses is not None else load_simbad_recorded()
+    app = web.Application()
+
+    async def sim_script(request: web.Request) -> web.Response:
+        form = await request.post()
+        match = re.search(r"query id (.+)", form.get("script", ""))
+        name = match.group(1).strip() if match else ""
+        if latency:
+            await asyncio.sleep(latency)
+        return web.Response(text=recorded.get(name, SIMBAD_NOT_FOUND))
+
+    app.router.add_post("/simbad/sim-script", sim_script)
+    return app
+
+
+def openai_stub(latency: float = 0.0, chunk_delay: float = 0.0):
+    """
+    OpenAI-compatible `/v1/chat/completions` stand-in.
+
+    Args:
+        latency (float): Seconds to wait before the first byte (time to first token).
+        chunk_delay (float): Seconds between streamed chunks when `stream=true`.
+    """
+    app = web.Application()
+
+    async def chat_completions(request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        match = re.search(r'star "([^"]+)', prompt)
+        content = MYTHOLOGY_COMPLETION.format(
+            star=match.group(1) if match else "This star"
+        )
+        model = body.get("model", "gpt-4o")
+        usage = {
+            "prompt_tokens": len(prompt.split()),
+            "completion_tokens": len(content.split()),
+            "total_tokens": len(prompt.split()) + len(content.split()),
+        }
+        if latency:
+            await asyncio.sleep(latency)
+
+        if not body.get("stream"):
+            return web.json_response(
+                {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": usage,
+                }
+            )
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for word in content.split(" "):
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": word + " "}}],
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            if chunk_delay:
+                await asyncio.sleep(chunk_delay)
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    return app
+
+
+def synthetic_tracks(count: int, seed: int = 0) -> list[dict]:
+    """Deterministic fake tracks with Spotify-like audio features."""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"track{i:06d}",
+            "name": f"Track {i}",
+            "artists": [{"name": f"Artist {rng.randrange(max(count // 10, 1))}"}],
+            "valence": round(rng.random(), 3),
+            "energy": round(rng.random(), 3),
+            "tempo": round(rng.uniform(60, 200), 3),
+            "acousticness": round(rng.random(), 3),
+        }
+        for i in range(count)
+    ]
+
+
+def spotify_stub(
+    tracks: list[dict], playlists: int = 1, latency: float = 0.0, page_size: int = 100
+):
+    """
+    Spotify Web API stand-in: client-credentials token, paginated playlist
+    tracks (`playlist0` .. `playlist{n-1}` split `tracks` evenly) and batched
+    `/audio-features`.
+    """
+    app = web.Application()
+    by_id = {track["id"]: track for track in tracks}
+    per_playlist = -(-len(tracks) // playlists)
+
+    async def token(request: web.Request) -> web.Response:
+        return web.json_response(
+            {"access_token": "stub", "token_type": "Bearer", "expires_in": 3600}
+        )
+
+    async def playlist_tracks(request: web.Request) -> web.Response:
+        number = int(request.match_info["playlist_id"].removeprefix("playlist"))
+        members = tracks[number * per_playlist : (number + 1) * per_playlist]
+        offset = int(request.query.get("offset", 0))
+        limit = min(int(request.query.get("limit", page_size)), page_size)
+        if latency:
+            await asyncio.sleep(latency)
+        page = members[offset : offset + limit]
+        next_url = None
+        if offset + limit < len(members):
+            next_url = str(request.url.update_query(offset=offset + limit, limit=limit))
+        return web.json_response(
+            {
+                "items": [
+                    {
+                        "track": {
+                            "id": t["id"],
+                            "name": t["name"],
+                            "artists": t["artists"],
+                        }
+                    }
+                    for t in page
+                ],
+                "next": next_url,
+            }
+        )
+
+    async def audio_features(request: web.Request) -> web.Response:
+        ids = request.query.get("ids", "").split(",")
+        if len(ids) > 100:
+            return web.json_response({"error": "too many ids"}, status=400)
+        if latency:
+            await asyncio.sleep(latency)
+        features = []
+        for track_id in ids:
+            track = by_id.get(track_id)
+            features.append(
+                None
+                if track is None
+                else {
+                    "id": track_id,
+                    **{
+                        name: track[name]
+                        for name in ("valence", "energy", "tempo", "acousticness")
+                    },
+                }
+            )
+        return web.json_response({"audio_features": features})
+
+    app.router.add_post("/api/token", token)
+    app.router.add_get("/v1/playlists/{playlist_id}/tracks", playlist_tracks)
+    app.router.add_get("/v1/audio-features", audio_features)
+    return app
@@ -0,0 +1,28 @@
+import asyncio
+
+from prefect.deployments import Deployment
+from prefect.server.schemas.schedules import IntervalSchedule, PositiveDuration
+
+from src.automation.flows.ingest_music import ingest_music_flow
+from src.automation.logging import get_prefect_logger
+
+logger = get_prefect_logger()
+
+
+async def apply_deployment():
+    """
+    Creates and applies the music ingestion deployment.
+    Runs weekly; playlists change slowly and the API only reads the local index.
+    """
+    deployment = Deployment.build_from_flow(
+        flow=ingest_music_flow,
+        name="Ingest Music Features (weekly)",
+        schedule=IntervalSchedule(interval=PositiveDuration(days=7)),
+        work_queue_name="default",
+    )
+    deployment.apply()
+    logger.info("Deployment applied: music ingestion scheduled.")
+
+
+if __name__ == "__main__":
+    asyncio.run(apply_deployment())
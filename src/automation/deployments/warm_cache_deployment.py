@@ -0,0 +1,28 @@
+import asyncio
+
+from prefect.deployments import Deployment
+from prefect.server.schemas.schedules import IntervalSchedule, PositiveDuration
+
+from src.automation.flows.warm_cache import warm_hot_cache
+from src.automation.logging import get_prefect_logger
+
+logger = get_prefect_logger()
+
+
+async def apply_deployment():
+    """
+    Creates and applies the cache warming deployment.
+    Runs every 6 hours, well inside the refresh window of hot keys.
+    """
+    deployment = Deployment.build_from_flow(
+        flow=warm_hot_cache,
+        name="Warm Hot Cache (every 6 hours)",
+        schedule=IntervalSchedule(interval=PositiveDuration(hours=6)),
+        work_queue_name="default",
+    )
+    deployment.apply()
+    logger.info("Deployment applied: hot cache warming scheduled.")
+
+
+if __name__ == "__main__":
+    asyncio.run(apply_deployment())
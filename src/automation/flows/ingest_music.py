@@ -0,0 +1,57 @@
+import time
+from prefect import task, flow
+from src.backend.services.music_index import MusicIndex, music_index_store
+from src.backend.services.spotify_api import (
+    SPOTIFY_PLAYLIST_IDS,
+    fetch_tracks_with_features,
+)
+from src.backend.core.metrics import FLOW_ITEMS, FLOW_DURATION
+from src.automation.logging import get_prefect_logger
+from src.automation.runtime import flow_clients
+
+logger = get_prefect_logger()
+
+FLOW_NAME = "ingest_music"
+
+
+@task
+async def fetch_tracks(playlist_ids: list[str]) -> list[dict]:
+    """Pulls playlist tracks and their audio features from Spotify."""
+    return await fetch_tracks_with_features(playlist_ids)
+
+
+@task
+async def build_music_index(tracks: list[dict]) -> int:
+    """Builds the audio-feature index and atomically replaces the stored one."""
+    index = MusicIndex.from_tracks(tracks)
+    music_index_store.replace(index)
+    return len(index)
+
+
+@flow(name="Ingest Music Features Flow")
+async def ingest_music_flow(playlist_ids: list[str] | None = None):
+    """
+    Rebuilds the local music index from Spotify audio features, so track
+    recommendations never call the music API on the request path.
+    """
+    start = time.perf_counter()
+    playlist_ids = playlist_ids or SPOTIFY_PLAYLIST_IDS
+    if not playlist_ids:
+        logger.warning("No playlists configured (SPOTIFY_PLAYLIST_IDS); skipping.")
+        return
+
+    async with flow_clients():
+        tracks = await fetch_tracks(playlist_ids)
+        if not tracks:
+            # Keep the previous index rather than replacing it with an empty one
+            logger.warning(
+                "No tracks with audio features fetched; index left unchanged."
+            )
+            FLOW_ITEMS.labels(FLOW_NAME, "failed").inc()
+            return
+
+        indexed = await build_music_index(tracks)
+        FLOW_ITEMS.labels(FLOW_NAME, "indexed").inc(indexed)
+        elapsed = time.perf_counter() - start
+        FLOW_DURATION.labels(FLOW_NAME).observe(elapsed)
+        logger.info(f"Indexed {indexed} tracks in {elapsed:.1f}s")
@@ -1,31 +1,37 @@
 import asyncio
-from datetime import datetime, timedelta, timezone
+import time
 from prefect import task, flow
-from sqlalchemy import select, update
+from sqlalchemy import select
 from src.backend.models.star import Star
 from src.backend.core.database import async_session_maker
-from src.backend.services.redis_client import redis_client
-from src.backend.services.ai_star_info import analyze_star_mythology
+from src.backend.services.ai_star_info import (
+    MYTHOLOGY_PROMPT_HASH,
+    generate_mythology,
+    save_mythology,
+)
+from src.backend.core.metrics import FLOW_ITEMS, FLOW_DURATION
 from src.automation.logging import get_prefect_logger
+from src.automation.runtime import flow_clients
 
 logger = get_prefect_logger()
 
-MYTHOLOGY_CACHE_TTL = 31_536_000  # 1 year
+FLOW_NAME = "update_star_mythology"
 
 
 @task
 async def get_stars_for_mythology_update():
     """
     Retrieves stars that require mythology updates.
-    Stars are selected if their last mythology update was more than a year ago or is missing.
+    Stars are selected if their mythology is missing or was generated by a
+    different prompt; documents with the current prompt hash are left as is.
     """
+    prompt_hash = Star.mythology["prompt_hash"].as_string()
     async with async_session_maker() as session:
-        one_year_ago = datetime.now(timezone.utc) - timedelta(days=365)
-
         result = await session.execute(
             select(Star.name).where(
-                (Star.last_mythology_update.is_(None))
-                | (Star.last_mythology_update < one_year_ago)
+                Star.mythology.is_(None)
+                | prompt_hash.is_(None)
+                | (prompt_hash != MYTHOLOGY_PROMPT_HASH)
             )
         )
         stars_to_update = result.scalars().all()
@@ -36,53 +42,42 @@ async def get_stars_for_mythology_update():
 @task
 async def update_star_mythology(star_name: str):
     """
-    Updates the mythology description of a star in the database and caches it in Redis for one year.
+    Regenerates the mythology document of a star and stores it in the database.
+    Redis is keyed by the name clients ask for, so the API re-caches the new
+    document on its next read; cached copies with the old prompt hash are ignored.
     """
-    async with async_session_maker() as session:
-        star_record = await session.get(Star, star_name)
-
-        if not star_record:
-            logger.warning(
-                f"Star {star_name} not found in the database, skipping update"
-            )
-            return
-
-        # Generate new mythology
-        mythology_data = await analyze_star_mythology(star_name, star_record.__dict__)
-
-        if not mythology_data:
-            logger.warning(f"Mythology data for {star_name} could not be retrieved")
-            return
-
-        # Update the database
-        await session.execute(
-            update(Star)
-            .where(Star.name == star_name)
-            .values(
-                mythology=mythology_data,
-                last_mythology_update=datetime.now(timezone.utc),
-            )
-        )
-        await session.commit()
+    try:
+        document = await generate_mythology(star_name)
+    except Exception as e:
+        logger.warning(f"Mythology for {star_name} could not be generated: {e}")
+        FLOW_ITEMS.labels(FLOW_NAME, "failed").inc()
+        return
 
-        # Cache mythology for 1 year
-        await redis_client.setex(
-            f"mythology:{star_name}", MYTHOLOGY_CACHE_TTL, mythology_data
-        )
+    if not await save_mythology(star_name, document):
+        logger.warning(f"Star {star_name} not found in the database, skipping update")
+        FLOW_ITEMS.labels(FLOW_NAME, "skipped").inc()
+        return
 
-        logger.info(f"Mythology for {star_name} updated successfully")
+    FLOW_ITEMS.labels(FLOW_NAME, "updated").inc()
+    logger.info(f"Mythology for {star_name} updated successfully")
 
 
 @flow(name="Update Star Mythology Flow")
 async def update_star_mythology_flow():
     """
-    Updates star mythology using AI analysis and caches it in Redis for one year.
+    Updates star mythology using AI analysis.
     """
-    stars = await get_stars_for_mythology_update()
+    start = time.perf_counter()
+    async with flow_clients():
+        stars = await get_stars_for_mythology_update()
 
-    if not stars:
-        logger.info("No mythology updates needed; all data is already up-to-date.")
-        return
+        if not stars:
+            logger.info("No mythology updates needed; all data is already up-to-date.")
+            return
+
+        tasks = [update_star_mythology(star) for star in stars]
+        await asyncio.gather(*tasks)
 
-    tasks = [update_star_mythology(star) for star in stars]
-    await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+        FLOW_DURATION.labels(FLOW_NAME).observe(elapsed)
+        logger.info(f"Processed {len(stars)} stars in {elapsed:.1f}s")
@@ -1,21 +1,25 @@
 import asyncio
+import time
 from prefect import task, flow
-from src.backend.services.simbad_api import fetch_star_data
+from sqlalchemy import select
+from src.backend.services.simbad_api import fetch_star_data, to_star_record
+from src.backend.services.sky_index import sky_index_store
 from src.backend.models.star import Star
 from src.backend.core.database import async_session_maker
-from src.backend.services.redis_client import redis_client
+from src.backend.core.metrics import FLOW_ITEMS, FLOW_DURATION
 from src.automation.logging import get_prefect_logger
+from src.automation.runtime import flow_clients
 
 logger = get_prefect_logger()
 
-DATA_CACHE_TTL = 7776000  # 3 months
+FLOW_NAME = "update_star_data"
 
 
 @task
 async def get_stars_from_db():
     """Retrieves the list of stars from the database."""
     async with async_session_maker() as session:
-        result = await session.execute("SELECT name FROM stars")
+        result = await session.execute(select(Star.name))
         stars = result.scalars().all()
     return stars
 
@@ -23,34 +27,46 @@ async def get_stars_from_db():
 @task
 async def update_star_in_db(star_name: str):
     """Updates star data in the database and Redis cache."""
-    star_data = await fetch_star_data(star_name)
+    # Bypasses the cache; the fresh data is re-cached with a popularity-based TTL
+    star_data = await fetch_star_data(star_name, refresh=True)
 
     if not star_data:
         logger.warning(f"Data for {star_name} not found")
+        FLOW_ITEMS.labels(FLOW_NAME, "failed").inc()
         return
 
     # Updating the database
     async with async_session_maker() as session:
-        star_record = await session.get(Star, star_name)
+        result = await session.execute(select(Star).where(Star.name == star_name))
+        star_record = result.scalars().first()
         if star_record:
-            star_record.update_from_dict(star_data)
+            for column, value in to_star_record(star_data).items():
+                setattr(star_record, column, value)
         else:
-            session.add(Star(**star_data))
+            session.add(Star(**to_star_record(star_data)))
         await session.commit()
 
-    # Updating Redis cache
-    await redis_client.setex(f"star:{star_name}", DATA_CACHE_TTL, star_data)
+    FLOW_ITEMS.labels(FLOW_NAME, "updated").inc()
     logger.info(f"Data for {star_name} updated successfully")
 
 
 @flow(name="Update Star Data Flow")
 async def update_star_data():
     """Updates star characteristics from the SIMBAD API and caches them in Redis."""
-    stars = await get_stars_from_db()
+    start = time.perf_counter()
+    async with flow_clients():
+        stars = await get_stars_from_db()
 
-    if not stars:
-        logger.info("No stars available for update")
-        return
+        if not stars:
+            logger.info("No stars available for update")
+            return
+
+        tasks = [update_star_in_db(star) for star in stars]
+        await asyncio.gather(*tasks)
+
+        # Coordinates may have changed, so refresh the persisted sky index
+        await sky_index_store.rebuild()
 
-    tasks = [update_star_in_db(star) for star in stars]
-    await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+        FLOW_DURATION.labels(FLOW_NAME).observe(elapsed)
+        logger.info(f"Processed {len(stars)} stars in {elapsed:.1f}s")
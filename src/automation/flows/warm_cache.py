@@ -0,0 +1,41 @@
+import time
+from prefect import task, flow
+from src.backend.services import hot_keys
+from src.backend.services.cache_warming import warm_hot_keys
+from src.backend.core.metrics import FLOW_ITEMS, FLOW_DURATION
+from src.automation.logging import get_prefect_logger
+from src.automation.runtime import flow_clients
+
+logger = get_prefect_logger()
+
+FLOW_NAME = "warm_hot_cache"
+
+
+@task
+async def refresh_hot_stars(limit: int) -> int:
+    """Refreshes cache entries of the hottest stars that are about to expire."""
+    return await warm_hot_keys(limit)
+
+
+@task
+async def decay_access_counts():
+    """Halves access counters so popularity tracks recent traffic."""
+    await hot_keys.decay()
+
+
+@flow(name="Warm Hot Cache Flow")
+async def warm_hot_cache(limit: int = hot_keys.TOP_K, decay: bool = True):
+    """
+    Refreshes the most requested stars before their cache entries expire,
+    then ages the access counters.
+    """
+    start = time.perf_counter()
+    async with flow_clients():
+        refreshed = await refresh_hot_stars(limit)
+        if decay:
+            await decay_access_counts()
+
+        FLOW_ITEMS.labels(FLOW_NAME, "refreshed").inc(refreshed)
+        elapsed = time.perf_counter() - start
+        FLOW_DURATION.labels(FLOW_NAME).observe(elapsed)
+        logger.info(f"Refreshed {refreshed} hot stars in {elapsed:.1f}s")
@@ -0,0 +1,30 @@
+from contextlib import asynccontextmanager
+
+from src.automation.logging import get_prefect_logger
+from src.backend.core.services import services
+from src.backend.services.flow_metrics import publish_flow_metrics
+from src.backend.services.redis_client import redis_client
+
+logger = get_prefect_logger()
+
+
+@asynccontextmanager
+async def flow_clients():
+    """
+    Connects Redis for a flow run. On exit, publishes the run's flow metrics
+    (so the API's /metrics shows them) and closes every client the run built.
+    """
+    try:
+        await redis_client.connect()
+    except Exception as e:
+        logger.error(f"Redis connection failed: {e}")
+
+    try:
+        yield
+    finally:
+        try:
+            await publish_flow_metrics()
+        except Exception as e:
+            logger.warning(f"Flow metrics could not be published: {e}")
+        await redis_client.close()
+        await services.aclose()
@@ -1,15 +1,69 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import logging
+import os
+import time
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from src.backend.config.settings import settings
+from src.backend.core.metrics import UPSTREAM_DURATION, UPSTREAM_ERRORS
+from src.backend.core.services import services
+from src.backend.core.tracing import start_span
 from typing import AsyncGenerator
 
 DATABASE_URL = settings.DATABASE_URL
+# Statements slower than this (seconds) are logged instead of echoing every query
+SLOW_QUERY_THRESHOLD = float(os.getenv("SLOW_QUERY_THRESHOLD", "0.5"))
 
-# Create the async engine
-engine = create_async_engine(DATABASE_URL, echo=True)
+slow_query_logger = logging.getLogger("sqlalchemy.slow_query")
 
-async_session_maker = async_sessionmaker(
-    bind=engine, class_=AsyncSession, expire_on_commit=False
-)
+
+def _statement_kind(statement: str) -> str:
+    """Returns the SQL verb (select/insert/update/...) used as the metric label."""
+    parts = statement.split(None, 1)
+    return parts[0].lower() if parts else "unknown"
+
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+    context._query_span = start_span(
+        f"sql.{_statement_kind(statement)}", statement=statement[:500]
+    )
+
+
+def _record_query_latency(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    UPSTREAM_DURATION.labels("postgres", _statement_kind(statement)).observe(elapsed)
+    if elapsed >= SLOW_QUERY_THRESHOLD:
+        slow_query_logger.warning(
+            "Slow query (%.3fs): %s",
+            elapsed,
+            statement,
+            extra={"duration": round(elapsed, 6), "parameters": repr(parameters)[:500]},
+        )
+    if context._query_span is not None:
+        context._query_span.end()
+
+
+def _record_query_error(exception_context):
+    statement = exception_context.statement or ""
+    UPSTREAM_ERRORS.labels("postgres", _statement_kind(statement)).inc()
+    execution_context = exception_context.execution_context
+    query_span = getattr(execution_context, "_query_span", None)
+    if query_span is not None:
+        query_span.end(exception_context.original_exception)
+
+
+def build_engine() -> AsyncEngine:
+    """Creates the async engine with query metrics and tracing listeners."""
+    engine = create_async_engine(DATABASE_URL)
+    event.listen(engine.sync_engine, "before_cursor_execute", _start_query_timer)
+    event.listen(engine.sync_engine, "after_cursor_execute", _record_query_latency)
+    event.listen(engine.sync_engine, "handle_error", _record_query_error)
+    return engine
+
+
+def async_session_maker() -> AsyncSession:
+    """Opens a session; the engine is created on first use (see `services`)."""
+    return services.session_factory()()
 
 
 # Dependency to get an async session
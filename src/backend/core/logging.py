@@ -0,0 +1,191 @@
+import atexit
+import copy
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # "json" or "text"
+LOG_FILE = os.getenv("LOG_FILE", "")
+
+# Keep 1 in N INFO/DEBUG records for high-volume loggers; warnings are never sampled
+# unless the logger is listed in SAMPLED_UP_TO.
+# Override with LOG_SAMPLING="logger.name=N,other.logger=M".
+DEFAULT_SAMPLING = {
+    # One access line per request
+    "uvicorn.access": 10,
+}
+
+# Loggers sampled below a level higher than WARNING once LOG_SAMPLING lists them
+# (records at or above it always pass). Slow-query warnings replace SQL echo, so
+# they are kept in full unless configured.
+SAMPLED_UP_TO = {
+    "sqlalchemy.slow_query": logging.ERROR,
+}
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RECORD_ATTRIBUTES = set(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: logging.handlers.QueueHandler | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Formatted by StructuredQueueHandler before the record was queued
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = record.stack_info
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records with the traceback kept apart from the message.
+
+    The stock prepare() formats the record on the producer side, folding the
+    traceback into `message` and clearing `exc_info`. Here only the message is
+    merged with its args and the traceback goes to `exc_text`, which the JSON
+    formatter emits as `exc_info` and the text formatter appends as usual.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Passes 1 in `every` records below `up_to`; higher levels always pass."""
+
+    def __init__(self, every: int, up_to: int = logging.WARNING):
+        super().__init__()
+        self.every = max(1, every)
+        self.up_to = up_to
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.up_to:
+            return True
+        return next(self._counter) % self.every == 0
+
+
+class DeferredFileHandler(logging.FileHandler):
+    """Creates the log file and its directory on the first record, not on setup."""
+
+    def __init__(self, filename: str):
+        super().__init__(filename, mode="a", encoding="utf-8", delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+def _parse_sampling(value: str) -> dict[str, int]:
+    sampling = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, every = item.partition("=")
+        sampling[name.strip()] = int(every)
+    return sampling
+
+
+def _build_formatter(log_format: str) -> logging.Formatter:
+    return JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
+
+
+def setup_logging(
+    level: str = LOG_LEVEL,
+    log_format: str = LOG_FORMAT,
+    log_file: str = LOG_FILE,
+) -> logging.handlers.QueueHandler:
+    """
+    Configures application logging once per process; later calls are no-ops.
+
+    Records are put on an in-memory queue by a QueueHandler on the root logger and
+    written to the console (and optionally a file) by a QueueListener thread, so
+    log I/O never blocks the event loop.
+
+    Returns:
+        logging.handlers.QueueHandler: The handler attached to the root logger.
+    """
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        return _queue_handler
+
+    formatter = _build_formatter(log_format)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(DeferredFileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = StructuredQueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+
+    sampling = {**DEFAULT_SAMPLING, **_parse_sampling(os.getenv("LOG_SAMPLING", ""))}
+    for name, every in sampling.items():
+        if every > 1:
+            up_to = SAMPLED_UP_TO.get(name, logging.WARNING)
+            logging.getLogger(name).addFilter(SamplingFilter(every, up_to))
+
+    return _queue_handler
+
+
+def attach_to(logger: logging.Logger) -> logging.Logger:
+    """
+    Routes a non-propagating logger (e.g. Prefect's) through the shared queue.
+    Safe to call repeatedly: the handler is only added once.
+    """
+    handler = setup_logging()
+    if not logger.propagate and handler not in logger.handlers:
+        logger.addHandler(handler)
+    return logger
+
+
+def shutdown_logging():
+    """Flushes queued records and stops the listener thread."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener = None
+        _queue_handler = None
@@ -0,0 +1,359 @@
+import time
+from bisect import bisect_left
+
+# Latency buckets in seconds, from a fast Redis hit up to a slow GPT-4o completion
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        # One slot per bucket plus the implicit +Inf bucket
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class _Metric:
+    """Base class for a metric family; children are keyed by label values."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """
+        Returns the child for the given label values.
+        Hot paths should bind the child once and reuse it.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values}"
+                )
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @property
+    def exposition_name(self) -> str:
+        """Name used in the HELP/TYPE lines."""
+        return self.name
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.exposition_name} {self.documentation}",
+            f"# TYPE {self.exposition_name} {self.type_name}",
+        ]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple, child) -> list[str]:
+        raise NotImplementedError
+
+    def samples(self) -> dict[tuple, dict[str, float]]:
+        """Raw child state by label values, for exporting to another process."""
+        return {
+            values: self._child_samples(child)
+            for values, child in self._children.items()
+        }
+
+    def set_samples(self, values: tuple, samples: dict[str, float]):
+        """Overwrites a child's state with samples exported by samples()."""
+        raise NotImplementedError
+
+    def _child_samples(self, child) -> dict[str, float]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    @property
+    def exposition_name(self) -> str:
+        # Samples are named `<name>_total`; HELP/TYPE must use the same name
+        return f"{self.name}_total"
+
+    def _render_child(self, values, child):
+        labels = _format_labels(self.labelnames, values)
+        return [f"{self.name}_total{labels} {_format_number(child.value)}"]
+
+    def _child_samples(self, child):
+        return {"total": child.value}
+
+    def set_samples(self, values, samples):
+        self.labels(*values).value = samples.get("total", 0)
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; observe() is a bisect and two additions."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _render_child(self, values, child):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+            cumulative += count
+            le = 'le="' + _format_number(bound) + '"'
+            labels = _format_labels(self.labelnames, values, le)
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_number(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def _child_samples(self, child):
+        samples = {f"bucket:{i}": count for i, count in enumerate(child.counts)}
+        samples["sum"] = child.sum
+        return samples
+
+    def set_samples(self, values, samples):
+        child = self.labels(*values)
+        child.counts = [
+            int(samples.get(f"bucket:{i}", 0)) for i in range(len(child.counts))
+        ]
+        child.sum = float(samples.get("sum", 0.0))
+
+
+class MetricsRegistry:
+    """Holds all metric families and renders them in Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Singleton registry
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "antares_http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ("method", "route", "status"),
+)
+UPSTREAM_DURATION = registry.histogram(
+    "antares_upstream_duration_seconds",
+    "Latency of calls to upstream services (SIMBAD, NASA, OpenAI, Postgres, Redis).",
+    ("upstream", "operation"),
+)
+UPSTREAM_ERRORS = registry.counter(
+    "antares_upstream_errors",
+    "Failed calls to upstream services.",
+    ("upstream", "operation"),
+)
+CACHE_REQUESTS = registry.counter(
+    "antares_cache_requests",
+    "Redis cache lookups by keyspace and result (hit/miss).",
+    ("keyspace", "result"),
+)
+OPENAI_TOKENS = registry.counter(
+    "antares_openai_tokens",
+    "OpenAI token usage by model and kind (prompt/completion).",
+    ("model", "kind"),
+)
+FLOW_ITEMS = registry.counter(
+    "antares_flow_items",
+    "Stars processed by Prefect flows, by outcome.",
+    ("flow", "status"),
+)
+FLOW_DURATION = registry.histogram(
+    "antares_flow_duration_seconds",
+    "Wall time of Prefect flow runs.",
+    ("flow",),
+    buckets=(1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0),
+)
+
+
+class UpstreamMetrics:
+    """
+    Bound duration and error children of one upstream operation.
+
+    Bind once at import and time inline on hot paths (Redis), which costs two
+    perf_counter() calls and a bisect per call:
+
+        start = time.perf_counter()
+        try:
+            ...
+        except Exception:
+            REDIS_GET.fail()
+            raise
+        finally:
+            REDIS_GET.observe(start)
+    """
+
+    __slots__ = ("_duration", "_errors")
+
+    def __init__(self, upstream: str, operation: str):
+        self._duration = UPSTREAM_DURATION.labels(upstream, operation)
+        self._errors = UPSTREAM_ERRORS.labels(upstream, operation)
+
+    def observe(self, start: float):
+        """Records the time elapsed since `start` (a perf_counter() value)."""
+        self._duration.observe(time.perf_counter() - start)
+
+    def fail(self):
+        self._errors.inc()
+
+
+_upstream_metrics = {}
+
+
+def upstream_metrics(upstream: str, operation: str) -> UpstreamMetrics:
+    """The shared UpstreamMetrics of an (upstream, operation) pair."""
+    metrics = _upstream_metrics.get((upstream, operation))
+    if metrics is None:
+        metrics = _upstream_metrics.setdefault(
+            (upstream, operation), UpstreamMetrics(upstream, operation)
+        )
+    return metrics
+
+
+class track_upstream:
+    """
+    Context manager that times a call to an upstream service and counts failures.
+    Meant for network calls (SIMBAD, OpenAI, ...), where its ~1us is noise;
+    hot paths time inline with `upstream_metrics()`.
+
+    Usage:
+        with track_upstream("simbad", "sim-script"):
+            ...
+    """
+
+    __slots__ = ("_metrics", "_start")
+
+    def __init__(self, upstream: str, operation: str):
+        self._metrics = upstream_metrics(upstream, operation)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._metrics.observe(self._start)
+        if exc_type is not None:
+            self._metrics.fail()
+        return False
+
+    def fail(self):
+        """Marks the call as failed without raising (e.g. a non-200 response)."""
+        self._metrics.fail()
+
+
+def record_cache_lookup(key: str, hit: bool):
+    """Counts a cache hit or miss under the key's prefix (`star`, `mythology`, ...)."""
+    keyspace = key.partition(":")[0]
+    CACHE_REQUESTS.labels(keyspace, "hit" if hit else "miss").inc()
+
+
+def record_openai_usage(model: str, usage) -> None:
+    """Adds token counts from an OpenAI response `usage` object."""
+    if usage is None:
+        return
+    OPENAI_TOKENS.labels(model, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    OPENAI_TOKENS.labels(model, "completion").inc(
+        getattr(usage, "completion_tokens", 0) or 0
+    )
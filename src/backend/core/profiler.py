@@ -0,0 +1,87 @@
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Debug profiling is disabled unless a token is configured
+DEBUG_PROFILE_TOKEN = os.getenv("DEBUG_PROFILE_TOKEN", "")
+PROFILE_HEADER = "X-Debug-Profile"
+PROFILE_QUERY_PARAM = "debug_profile"
+PROFILE_INTERVAL = 0.001  # seconds between samples
+
+
+class SamplingProfiler:
+    """
+    Samples the call stack of one thread from a background thread.
+
+    The result is in the collapsed ("folded") stack format understood by
+    flamegraph.pl, speedscope and inferno: one `frame;frame;frame count` per line.
+    Since the event loop is shared, concurrent requests show up in the profile too.
+
+    Usage:
+        with SamplingProfiler() as profiler:
+            ...
+        profiler.collapsed()
+    """
+
+    def __init__(
+        self, interval: float = PROFILE_INTERVAL, thread_id: int | None = None
+    ):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                filename = os.path.basename(code.co_filename)
+                stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.reverse()
+            self.samples[";".join(stack)] += 1
+            self.sample_count += 1
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def collapsed(self) -> str:
+        """Returns the profile as collapsed stacks, heaviest first."""
+        return "\n".join(
+            f"{stack} {count}" for stack, count in self.samples.most_common()
+        )
+
+
+def profiling_requested(headers, query_params) -> bool:
+    """Checks the debug header / query param against the configured token."""
+    if not DEBUG_PROFILE_TOKEN:
+        return False
+    supplied = headers.get(PROFILE_HEADER) or query_params.get(PROFILE_QUERY_PARAM)
+    return bool(supplied) and hmac.compare_digest(
+        supplied.encode(), DEBUG_PROFILE_TOKEN.encode()
+    )
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import os
+
+from src.backend.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Total timeout (seconds) for requests on the shared upstream HTTP session
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+
+
+class ServiceRegistry:
+    """
+    Process-wide service clients, built on first use instead of at import.
+
+    Client libraries (openai, aiohttp, the SQLAlchemy async engine) are imported
+    by the accessor that builds the client, so importing the app stays cheap.
+    Redis is connected by the lifespan hook (see `redis_client`). The API closes
+    everything from its lifespan hook; flows and scripts call `aclose()`.
+    """
+
+    def __init__(self):
+        self._engine = None
+        self._session_factory = None
+        self._http = None
+        self._http_loop = None
+        self._openai = None
+        self._openai_loop = None
+        # Closes of clients left over from an earlier event loop
+        self._closing = set()
+
+    @property
+    def engine(self):
+        """The async database engine, with query metrics and tracing attached."""
+        if self._engine is None:
+            from src.backend.core.database import build_engine
+
+            self._engine = build_engine()
+        return self._engine
+
+    def session_factory(self):
+        """The session factory bound to `engine`."""
+        if self._session_factory is None:
+            from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+            self._session_factory = async_sessionmaker(
+                bind=self.engine, class_=AsyncSession, expire_on_commit=False
+            )
+        return self._session_factory
+
+    def http(self):
+        """
+        Shared aiohttp session for upstream APIs, so connections are pooled
+        across calls instead of opened per request.
+        """
+        loop = asyncio.get_running_loop()
+        # A session is bound to its event loop; scripts running several loops
+        # (asyncio.run per call) get a fresh one
+        if self._http is None or self._http.closed or self._http_loop is not loop:
+            import aiohttp
+
+            if self._http is not None:
+                self._discard(self._http)
+            self._http = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+            )
+            self._http_loop = loop
+        return self._http
+
+    def openai(self):
+        """Shared AsyncOpenAI client (one connection pool for all completions)."""
+        loop = asyncio.get_running_loop()
+        if self._openai is None or self._openai_loop is not loop:
+            import openai
+
+            if self._openai is not None:
+                self._discard(self._openai)
+            self._openai = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+            self._openai_loop = loop
+        return self._openai
+
+    def _discard(self, client):
+        """
+        Closes a client built on another event loop (e.g. an earlier
+        asyncio.run() that never called aclose()) from the current loop.
+        """
+        task = asyncio.get_running_loop().create_task(self._close_quietly(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_quietly(client):
+        try:
+            await client.close()
+        except Exception as e:
+            # Its connections belonged to the old loop; the client is released anyway
+            logger.debug("Closing a client from a previous event loop failed: %s", e)
+
+    async def aclose(self):
+        """Closes every client built so far; they are rebuilt on next use."""
+        loop = asyncio.get_running_loop()
+        pending = [task for task in self._closing if task.get_loop() is loop]
+        if pending:
+            await asyncio.gather(*pending)
+        if self._http is not None:
+            await self._close_quietly(self._http)
+            self._http = self._http_loop = None
+        if self._openai is not None:
+            await self._close_quietly(self._openai)
+            self._openai = self._openai_loop = None
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = self._session_factory = None
+        logger.debug("Service clients closed")
+
+
+services = ServiceRegistry()
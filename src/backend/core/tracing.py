@@ -0,0 +1,231 @@
+import functools
+import json
+import os
+import secrets
+import time
+from contextvars import ContextVar
+
+# Export settings: TRACE_EXPORT is "", "json" (waterfall) or "otlp" (OTLP/JSON)
+TRACE_EXPORT = os.getenv("TRACE_EXPORT", "")
+TRACE_DIR = os.getenv("TRACE_DIR", "traces")
+# Only export traces slower than this many seconds (0 exports every trace)
+TRACE_SLOW_THRESHOLD = float(os.getenv("TRACE_SLOW_THRESHOLD", "0"))
+
+SERVICE_NAME = "antares-murmurs"
+
+_current_trace: ContextVar["Trace | None"] = ContextVar("current_trace", default=None)
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed operation inside a trace."""
+
+    __slots__ = (
+        "trace",
+        "name",
+        "span_id",
+        "parent_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+    )
+
+    def __init__(self, trace: "Trace", name: str, parent_id: str | None, attributes):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.error = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def end(self, error: BaseException | None = None):
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_ns or time.time_ns()) - self.start_ns
+
+
+class Trace:
+    """All spans recorded while handling one request."""
+
+    def __init__(self, name: str):
+        self.trace_id = secrets.token_hex(16)
+        self.spans = []
+        self.root = self.add_span(name, None, {})
+
+    def add_span(self, name: str, parent_id: str | None, attributes: dict) -> Span:
+        new_span = Span(self, name, parent_id, attributes)
+        self.spans.append(new_span)
+        return new_span
+
+    @property
+    def duration(self) -> float:
+        return self.root.duration_ns / 1e9
+
+    def to_waterfall(self) -> dict:
+        """Returns the trace as a flat waterfall with offsets relative to the root."""
+        origin = self.root.start_ns
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "duration_ms": round(self.root.duration_ns / 1e6, 3),
+            "spans": [
+                {
+                    "name": s.name,
+                    "span_id": s.span_id,
+                    "parent_id": s.parent_id,
+                    "offset_ms": round((s.start_ns - origin) / 1e6, 3),
+                    "duration_ms": round(s.duration_ns / 1e6, 3),
+                    "attributes": s.attributes,
+                    "error": s.error,
+                }
+                for s in self.spans
+            ],
+        }
+
+    def to_otlp(self) -> dict:
+        """Returns the trace in OTLP/JSON form, loadable by OpenTelemetry tooling."""
+
+        def attribute(key, value):
+            if isinstance(value, bool):
+                return {"key": key, "value": {"boolValue": value}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            if isinstance(value, float):
+                return {"key": key, "value": {"doubleValue": value}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        spans = []
+        for s in self.spans:
+            otlp_span = {
+                "traceId": self.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": 2 if s is self.root else 1,  # SERVER / INTERNAL
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns or time.time_ns()),
+                "attributes": [attribute(k, v) for k, v in s.attributes.items()],
+                "status": (
+                    {"code": 2, "message": s.error} if s.error else {"code": 1}
+                ),
+            }
+            if s.parent_id:
+                otlp_span["parentSpanId"] = s.parent_id
+            spans.append(otlp_span)
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [attribute("service.name", SERVICE_NAME)]
+                    },
+                    "scopeSpans": [
+                        {"scope": {"name": "antares.tracing"}, "spans": spans}
+                    ],
+                }
+            ]
+        }
+
+
+def start_trace(name: str, **attributes) -> Trace:
+    """Starts a new trace and makes its root span current."""
+    trace = Trace(name)
+    trace.root.attributes.update(attributes)
+    _current_trace.set(trace)
+    _current_span.set(trace.root)
+    return trace
+
+
+def current_trace() -> Trace | None:
+    return _current_trace.get()
+
+
+def start_span(name: str, **attributes) -> Span | None:
+    """
+    Starts a leaf span under the current span without making it current.
+    Used from callbacks (e.g. SQLAlchemy events) where `with span()` does not fit.
+    Returns None when no trace is active.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    parent = _current_span.get()
+    return trace.add_span(name, parent.span_id if parent else None, attributes)
+
+
+class span:
+    """
+    Context manager recording a span under the current one.
+    Costs a single ContextVar lookup when no trace is active.
+
+    Usage:
+        with span("redis.get", key=key):
+            ...
+    """
+
+    __slots__ = ("_name", "_attributes", "_span", "_token")
+
+    def __init__(self, name: str, **attributes):
+        self._name = name
+        self._attributes = attributes
+        self._span = None
+
+    def __enter__(self) -> Span | None:
+        trace = _current_trace.get()
+        if trace is not None:
+            parent = _current_span.get()
+            self._span = trace.add_span(
+                self._name, parent.span_id if parent else None, self._attributes
+            )
+            self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._span is not None:
+            self._span.end(exc)
+            _current_span.reset(self._token)
+        return False
+
+
+def traced(name: str):
+    """Decorator wrapping an async function in a span."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def export_trace(trace: Trace, export_format: str = TRACE_EXPORT) -> str | None:
+    """
+    Writes the trace to TRACE_DIR as JSON. Blocking; call it off the event loop.
+
+    Returns:
+        str | None: Path of the written file, or None if exporting is disabled.
+    """
+    if export_format not in ("json", "otlp"):
+        return None
+    if trace.duration < TRACE_SLOW_THRESHOLD:
+        return None
+
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    payload = trace.to_otlp() if export_format == "otlp" else trace.to_waterfall()
+    suffix = ".otlp.json" if export_format == "otlp" else ".json"
+    path = os.path.join(TRACE_DIR, trace.trace_id + suffix)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    return path
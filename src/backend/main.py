@@ -1,40 +1,172 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from contextlib import asynccontextmanager
-from src.backend.routes import api
+from src.backend.core import tracing
+from src.backend.core.logging import setup_logging
+from src.backend.core.metrics import HTTP_REQUEST_DURATION
+from src.backend.core.profiler import SamplingProfiler, profiling_requested
+from src.backend.core.services import services
+from src.backend.routes import api, metrics, music, sky, stars
+from src.backend.services.cache_warming import warm_hot_keys, PREWARM_LIMIT
 from src.backend.services.redis_client import redis_client
+from src.backend.services.sky_index import sky_index_store
+import asyncio
 import logging
+import time
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
-)
-logging.info("Logging enabled")
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle event handler for FastAPI (replaces @app.on_event)"""
+    # Configure queued, structured logging here rather than on import
+    setup_logging()
+    prewarm = None
     try:
         await redis_client.connect()
-        logging.info("✅ Redis connection established.")
+        logger.info("✅ Redis connection established.")
+        # Prewarm the hottest stars in the background so startup isn't delayed
+        prewarm = asyncio.create_task(warm_hot_keys(PREWARM_LIMIT))
     except Exception as e:
-        logging.error(f"❌ Redis startup error: {e}")
+        logger.error("❌ Redis startup error: %s", e)
+
+    try:
+        await sky_index_store.load()
+    except Exception as e:
+        logger.error("❌ Sky index startup error: %s", e)
 
     yield  # This is where the app runs
 
+    if prewarm is not None and not prewarm.done():
+        prewarm.cancel()
+
     try:
         await redis_client.close()
-        logging.info("✅ Redis connection closed.")
+        logger.info("✅ Redis connection closed.")
+    except Exception as e:
+        logger.error("❌ Redis shutdown error: %s", e)
+
+    try:
+        await services.aclose()
     except Exception as e:
-        logging.error(f"❌ Redis shutdown error: {e}")
+        logger.error("❌ Service shutdown error: %s", e)
 
 
 app = FastAPI(title="Antares Murmurs", lifespan=lifespan)
 app.include_router(api.router)
+app.include_router(metrics.router)
+app.include_router(music.router)
+app.include_router(sky.router)
+app.include_router(stars.router)
+
+
+async def _finish_after_body(body_iterator, finish):
+    """Passes the body through and calls `finish` once it is fully sent."""
+    error = None
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        finish(error)
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """
+    Records request latency per route template (not per raw path), up to the
+    last body chunk so streamed responses (e.g. /stars) are timed in full.
+    """
+    start = time.perf_counter()
+
+    def finish(status: int):
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.labels(
+            request.method, getattr(route, "path", "unmatched"), str(status)
+        ).observe(time.perf_counter() - start)
+
+    try:
+        response = await call_next(request)
+    except Exception:
+        finish(500)
+        raise
+    response.body_iterator = _finish_after_body(
+        response.body_iterator, lambda error: finish(response.status_code)
+    )
+    return response
+
+
+def _finish_trace(
+    trace: tracing.Trace,
+    request: Request,
+    status: int,
+    export_format: str,
+    error: BaseException | None = None,
+):
+    """Ends the root span (named after the route template) and exports the trace."""
+    route = request.scope.get("route")
+    if route is not None:
+        trace.root.name = f"{request.method} {route.path}"
+    trace.root.set_attribute("http.status_code", status)
+    if trace.root.end_ns is None:
+        trace.root.end(error)
+    asyncio.get_running_loop().run_in_executor(
+        None, tracing.export_trace, trace, export_format
+    )
+
+
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    """
+    Records a span waterfall for the request and exports it if TRACE_EXPORT is set.
+    With a valid debug profile header/query param, runs the sampling profiler and
+    returns the collapsed-stack profile instead of the regular response body (the
+    trace is still exported if TRACE_EXPORT is set).
+    Without either, no trace is built and spans cost a single ContextVar lookup.
+    """
+    profiler = None
+    if profiling_requested(request.headers, request.query_params):
+        profiler = SamplingProfiler()
+        profiler.start()
+    export_format = tracing.TRACE_EXPORT
+    if not export_format and not profiler:
+        return await call_next(request)
+
+    # A profile on its own is only returned in the response, never written to disk
+    trace = None
+    if export_format:
+        trace = tracing.start_trace(f"{request.method} {request.url.path}")
+    try:
+        response = await call_next(request)
+        if profiler:
+            # Let the endpoint finish streaming before stopping the sampler
+            async for _ in response.body_iterator:
+                pass
+    except Exception as e:
+        if trace:
+            _finish_trace(trace, request, 500, export_format, e)
+        raise
+    finally:
+        if profiler:
+            profiler.stop()
 
-# Log available routes
-for route in app.routes:
-    logging.info(f" Available route: {getattr(route, 'path', 'Unknown')}")
+    status = response.status_code
+    if profiler:
+        if trace:
+            _finish_trace(trace, request, status, export_format)
+        response = Response(content=profiler.collapsed(), media_type="text/plain")
+        response.headers["X-Original-Status"] = str(status)
+    else:
+        # The root span covers the whole body, not just the time to headers
+        response.body_iterator = _finish_after_body(
+            response.body_iterator,
+            lambda error: _finish_trace(trace, request, status, export_format, error),
+        )
+    if trace:
+        response.headers["X-Trace-Id"] = trace.trace_id
+    return response
 
 
 @app.get("/")
@@ -0,0 +1,7 @@
+"""
+Schema migrations for existing databases. New databases get the current schema
+from `Base.metadata.create_all`; each migration is idempotent and is run once
+against an older database, e.g.
+
+    python -m src.backend.migrations.m0001_star_positions_and_mythology
+"""
@@ -0,0 +1,128 @@
+"""
+Brings `filtered_stars` up to the current Star model:
+
+- adds the `ra`/`dec` columns and fills them from the SIMBAD `coordinates`
+  string, so existing stars show up in the sky index;
+- converts `mythology` from plain text to a JSON document (JSONB on
+  PostgreSQL). Legacy text is kept as `{"version": 0, "legacy_text": ...}`;
+  it has no prompt hash, so it is never served and the *Update Star
+  Mythology* flow regenerates it;
+- drops the `ix_filtered_stars_mythology` GIN index if an earlier build
+  created it (the mythology filters compare `->>` values, which it can't serve).
+"""
+
+import asyncio
+import json
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.backend.core.logging import setup_logging
+from src.backend.core.services import services
+from src.backend.services.sky_index import parse_coordinates
+
+logger = logging.getLogger(__name__)
+
+TABLE = "filtered_stars"
+LEGACY_VERSION = 0
+
+
+def legacy_document(value: str | None) -> dict | None:
+    """Wraps pre-JSON mythology text; None for empty values."""
+    if value is None or not value.strip():
+        return None
+    return {"version": LEGACY_VERSION, "legacy_text": value}
+
+
+def _columns(sync_conn) -> dict:
+    return {column["name"]: column for column in inspect(sync_conn).get_columns(TABLE)}
+
+
+async def _add_positions(conn: AsyncConnection, columns: dict) -> None:
+    for name in ("ra", "dec"):
+        if name not in columns:
+            await conn.execute(text(f'ALTER TABLE {TABLE} ADD COLUMN "{name}" FLOAT'))
+            logger.info(f"Added {TABLE}.{name}")
+
+    result = await conn.execute(
+        text(
+            f"SELECT id, coordinates FROM {TABLE} "
+            f'WHERE ("ra" IS NULL OR "dec" IS NULL) AND coordinates IS NOT NULL'
+        )
+    )
+    updates = []
+    for star_id, coordinates in result.all():
+        position = parse_coordinates(coordinates)
+        if position is not None:
+            updates.append({"id": star_id, "ra": position[0], "dec": position[1]})
+    if updates:
+        await conn.execute(
+            text(f'UPDATE {TABLE} SET "ra" = :ra, "dec" = :dec WHERE id = :id'),
+            updates,
+        )
+    logger.info(f"Filled ra/dec for {len(updates)} stars")
+
+
+async def _convert_mythology_postgres(conn: AsyncConnection, columns: dict) -> None:
+    await conn.execute(text("DROP INDEX IF EXISTS ix_filtered_stars_mythology"))
+    if isinstance(columns["mythology"]["type"], JSONB):
+        return
+    await conn.execute(
+        text(
+            f"ALTER TABLE {TABLE} ALTER COLUMN mythology TYPE jsonb USING "
+            f"CASE WHEN mythology IS NULL OR btrim(mythology) = '' THEN NULL "
+            f"ELSE jsonb_build_object('version', {LEGACY_VERSION}, "
+            f"'legacy_text', mythology) END"
+        )
+    )
+    logger.info(f"Converted {TABLE}.mythology to jsonb")
+
+
+async def _convert_mythology_generic(conn: AsyncConnection) -> None:
+    # Other dialects store JSON as text, so only the values need rewriting
+    result = await conn.execute(
+        text(f"SELECT id, mythology FROM {TABLE} WHERE mythology IS NOT NULL")
+    )
+    updates = []
+    for star_id, value in result.all():
+        try:
+            if isinstance(json.loads(value), dict):
+                continue
+        except (TypeError, ValueError):
+            pass
+        document = legacy_document(value)
+        updates.append({"id": star_id, "mythology": document and json.dumps(document)})
+    if updates:
+        await conn.execute(
+            text(f"UPDATE {TABLE} SET mythology = :mythology WHERE id = :id"),
+            updates,
+        )
+    logger.info(f"Converted mythology of {len(updates)} stars to documents")
+
+
+async def upgrade(engine: AsyncEngine) -> None:
+    """Applies the migration in one transaction; safe to run again."""
+    async with engine.begin() as conn:
+        columns = await conn.run_sync(_columns)
+        if not columns:
+            logger.info(f"No {TABLE} table; nothing to migrate")
+            return
+        await _add_positions(conn, columns)
+        if conn.dialect.name == "postgresql":
+            await _convert_mythology_postgres(conn, columns)
+        else:
+            await _convert_mythology_generic(conn)
+
+
+async def main():
+    try:
+        await upgrade(services.engine)
+    finally:
+        await services.aclose()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(main())
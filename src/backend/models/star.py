@@ -1,16 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float
-from sqlalchemy.ext.asyncio import AsyncAttrs
-from sqlalchemy.orm import relationship, DeclarativeBase
-from src.backend.models.emotions import star_emotions_association
+from sqlalchemy import JSON, Column, Integer, String, Float
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+from src.backend.models.emotions import Base, star_emotions_association
 from sqlalchemy import DateTime
 
 
-class Base(AsyncAttrs, DeclarativeBase):
-    """Base class for all SQLAlchemy models (with async support)."""
-
-    pass
-
-
 class Star(Base):
     """Database model for storing filtered star data."""
 
@@ -23,10 +17,18 @@ class Star(Base):
     color = Column(String)
     temperature = Column(Integer)
     distance = Column(Float)
-    mythology = Column(String, nullable=True)  # Stores mythology description
+    coordinates = Column(String, nullable=True)  # ICRS, as returned by SIMBAD
+    ra = Column(Float, nullable=True)  # Right ascension, degrees
+    dec = Column(Float, nullable=True)  # Declination, degrees
+    # Versioned document: {version, sections, model, prompt_hash, generated_at}
+    # (see src/backend/migrations for databases created before it was JSON)
+    mythology = Column(
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"),
+        nullable=True,
+    )
     last_mythology_update = Column(DateTime, nullable=True)
 
     # Many-to-many relationship with emotions
     emotions = relationship(
-        "Emotions", secondary=star_emotions_association, back_populates="stars"
+        "Emotion", secondary=star_emotions_association, back_populates="stars"
     )
@@ -1,18 +1,44 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from src.backend.services.simbad_api import fetch_star_data
-from src.backend.services.ai_star_info import analyze_star_mythology
+from src.backend.services.ai_star_info import (
+    MYTHOLOGY_SECTIONS,
+    analyze_star_mythology,
+    get_mythology,
+)
+from src.backend.services.hot_keys import track_access
 import logging
 
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+SECTIONS_DESCRIPTION = "Comma-separated mythology sections: " + ", ".join(
+    MYTHOLOGY_SECTIONS
+)
+
+
+def _parse_sections(sections: str | None) -> list[str] | None:
+    if not sections:
+        return None
+    requested = [name.strip() for name in sections.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in MYTHOLOGY_SECTIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown sections: {', '.join(unknown)}"
+        )
+    return list(dict.fromkeys(requested))
 
 
 @router.get("/star_info/")
-async def get_star_info(star_name: str):
+async def get_star_info(
+    star_name: str,
+    sections: str | None = Query(default=None, description=SECTIONS_DESCRIPTION),
+):
     """
     API endpoint to fetch real astronomical data and AI-generated mythology for a given star.
     """
-    logging.info(f"🟡 API called with star_name: {star_name}")
+    logger.debug("🟡 API called with star_name: %s", star_name)
+    selected = _parse_sections(sections)
 
     try:
         # 1️⃣ Fetch real star data from SIMBAD
@@ -20,11 +46,40 @@ async def get_star_info(star_name: str):
 
         if not star_data:
             raise HTTPException(status_code=404, detail="Star data not found.")
+        # Only known stars count towards popularity
+        if "error" not in star_data:
+            track_access(star_name)
 
-        enriched_star_info = await analyze_star_mythology(star_name, star_data)
+        enriched_star_info = await analyze_star_mythology(
+            star_name, star_data, selected
+        )
 
         return enriched_star_info
 
     except Exception as e:
-        logging.error(f"❌ API Error: {e}")
+        logger.error("❌ API Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stars/{star_name}/mythology")
+async def get_star_mythology(
+    star_name: str,
+    sections: str | None = Query(default=None, description=SECTIONS_DESCRIPTION),
+):
+    """
+    Returns only the star's mythology, optionally limited to some sections.
+    """
+    selected = _parse_sections(sections)
+
+    star_data = await fetch_star_data(star_name)
+    if not star_data or "error" in star_data:
+        raise HTTPException(status_code=404, detail="Star data not found.")
+    track_access(star_name)
+
+    try:
+        mythology = await get_mythology(star_name, star_data, selected)
+    except Exception as e:
+        logger.error("❌ Mythology error for %s: %s", star_name, e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {"name": star_data.get("name", star_name), "mythology": mythology}
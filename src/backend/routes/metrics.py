@@ -0,0 +1,22 @@
+import logging
+
+from fastapi import APIRouter, Response
+from src.backend.core.metrics import registry, PROMETHEUS_CONTENT_TYPE
+from src.backend.services.flow_metrics import load_flow_metrics
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Exposes collected metrics in Prometheus text format.
+    Flow metrics are published to Redis by the Prefect worker and read back here.
+    """
+    try:
+        await load_flow_metrics()
+    except Exception as e:
+        # The in-process metrics are still worth scraping without flow metrics
+        logger.warning("Flow metrics could not be loaded from Redis: %s", e)
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
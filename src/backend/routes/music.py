@@ -0,0 +1,67 @@
+import asyncio
+import logging
+
+from fastapi import APIRouter, HTTPException, Query
+
+from src.backend.services.hot_keys import track_access
+from src.backend.services.music_index import music_index_store
+from src.backend.services.simbad_api import fetch_star_data
+from src.backend.services.star_music import (
+    CACHED_TRACKS,
+    EMOTION_FEATURES,
+    recommend_tracks,
+)
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+MAX_STARS = 50
+
+
+@router.get("/star_music/")
+async def get_star_music(
+    star_name: list[str] = Query(description="One or more star names"),
+    emotion: list[str] = Query(
+        default=[], description="The user's emotions: " + ", ".join(EMOTION_FEATURES)
+    ),
+    limit: int = Query(default=10, ge=1, le=CACHED_TRACKS),
+):
+    """
+    Recommends tracks matching each star's temperature, color, luminosity and
+    emotion profile, from the locally ingested audio-feature index.
+    """
+    names = list(dict.fromkeys(star_name))
+    if len(names) > MAX_STARS:
+        raise HTTPException(
+            status_code=422, detail=f"At most {MAX_STARS} stars per request."
+        )
+    unknown = [name for name in emotion if name.lower() not in EMOTION_FEATURES]
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown emotions: {', '.join(unknown)}"
+        )
+
+    index = await music_index_store.get()
+    if index is None or not len(index):
+        raise HTTPException(status_code=503, detail="Music index is not built yet.")
+
+    star_data = await asyncio.gather(*(fetch_star_data(name) for name in names))
+    missing = [
+        name for name, data in zip(names, star_data) if not data or "error" in data
+    ]
+    if missing:
+        raise HTTPException(
+            status_code=404, detail=f"Stars not found: {', '.join(missing)}"
+        )
+    for name in names:
+        track_access(name)
+
+    recommendations = await recommend_tracks(
+        index, dict(zip(names, star_data)), emotion, limit
+    )
+    return {
+        "emotions": emotion,
+        "stars": [
+            {"star_name": name, "tracks": recommendations[name]} for name in names
+        ],
+    }
@@ -0,0 +1,127 @@
+import math
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from src.backend.services.simbad_api import fetch_star_data
+from src.backend.services.sky_index import sky_index_store
+
+router = APIRouter(prefix="/sky")
+
+MAX_RESULTS = 1000
+MAX_BATCH_POINTS = 1000
+
+
+class SkyPoint(BaseModel):
+    ra: float = Field(ge=0, lt=360)
+    dec: float = Field(ge=-90, le=90)
+
+
+class ConeBatchRequest(BaseModel):
+    points: list[SkyPoint] = Field(min_length=1, max_length=MAX_BATCH_POINTS)
+    radius: float = Field(gt=0, le=180)
+    limit: int = Field(default=50, ge=1, le=MAX_RESULTS)
+
+
+def _matches(index, indices, values, key: str, limit: int) -> list[dict]:
+    """Serializes the first `limit` matches; `key` names the per-match value."""
+    matches = []
+    for i, value in zip(indices[:limit], values[:limit]):
+        magnitude = float(index.magnitudes[i])
+        matches.append(
+            {
+                "name": index.names[i],
+                "ra": round(float(index.ra[i]), 6),
+                "dec": round(float(index.dec[i]), 6),
+                "magnitude": None if math.isnan(magnitude) else magnitude,
+                key: round(float(value), 4),
+            }
+        )
+    return matches
+
+
+@router.get("/cone")
+async def cone_search(
+    radius: float = Query(gt=0, le=180, description="Cone radius in degrees"),
+    ra: float | None = Query(default=None, ge=0, lt=360),
+    dec: float | None = Query(default=None, ge=-90, le=90),
+    star_name: str | None = None,
+    limit: int = Query(default=50, ge=1, le=MAX_RESULTS),
+):
+    """
+    Stars within `radius` degrees of a point (ra/dec) or of a catalog star.
+    """
+    if star_name is not None:
+        # The index is keyed by SIMBAD's main identifier, as /star_info/ stores it
+        star_data = await fetch_star_data(star_name)
+        if not star_data or "error" in star_data:
+            raise HTTPException(status_code=404, detail="Star not found in SIMBAD.")
+        index = await sky_index_store.get()
+        center = index.position(star_data["name"])
+        if center is None:
+            raise HTTPException(status_code=404, detail="Star not found in sky index.")
+        ra, dec = center
+    elif ra is None or dec is None:
+        raise HTTPException(
+            status_code=422, detail="Provide either star_name or both ra and dec."
+        )
+    else:
+        index = await sky_index_store.get()
+
+    indices, separations = index.cone_search(ra, dec, radius)
+    return {
+        "center": {"ra": ra, "dec": dec},
+        "radius": radius,
+        "count": len(indices),
+        "stars": _matches(index, indices, separations, "separation", limit),
+    }
+
+
+@router.post("/cone")
+async def cone_search_batch(request: ConeBatchRequest):
+    """
+    Vectorized cone search for many centers in one call.
+    """
+    index = await sky_index_store.get()
+    results = index.cone_search_many(
+        [p.ra for p in request.points], [p.dec for p in request.points], request.radius
+    )
+    return {
+        "radius": request.radius,
+        "results": [
+            {
+                "center": point.model_dump(),
+                "count": len(indices),
+                "stars": _matches(
+                    index, indices, separations, "separation", request.limit
+                ),
+            }
+            for point, (indices, separations) in zip(request.points, results)
+        ],
+    }
+
+
+@router.get("/visible")
+async def visible_sky(
+    lat: float = Query(ge=-90, le=90, description="Observer latitude, degrees"),
+    lon: float = Query(ge=-180, le=180, description="Observer longitude, degrees east"),
+    at: datetime | None = Query(default=None, description="UTC time, defaults to now"),
+    min_altitude: float = Query(default=0.0, ge=-90, lt=90),
+    limit: int = Query(default=100, ge=1, le=MAX_RESULTS),
+):
+    """
+    Stars currently above the observer's horizon (or `min_altitude`), highest first.
+    """
+    if at is None:
+        at = datetime.now(timezone.utc)
+    elif at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+
+    index = await sky_index_store.get()
+    indices, altitudes = index.visible(lat, lon, at, min_altitude)[0]
+    return {
+        "observer": {"lat": lat, "lon": lon, "at": at.isoformat()},
+        "count": len(indices),
+        "stars": _matches(index, indices, altitudes, "altitude", limit),
+    }
@@ -0,0 +1,189 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import DateTime, Float, Integer, select
+
+from src.backend.core.database import async_session_maker
+from src.backend.models.star import Star
+
+router = APIRouter()
+
+# Rows fetched from the server-side cursor per round trip
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_COLUMNS = {column.name: column for column in Star.__table__.columns}
+# The large mythology document is only exported when asked for explicitly
+DEFAULT_FIELDS = [name for name in EXPORT_COLUMNS if name != "mythology"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Arrow IPC end-of-stream marker (continuation token + zero length)
+ARROW_EOS = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode_document(value):
+    """JSON-encodes document columns (mythology) for text and Arrow string cells."""
+    return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+
+def _parse_fields(fields: str | None) -> list[str]:
+    if not fields:
+        return DEFAULT_FIELDS
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in EXPORT_COLUMNS]
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    # `id` is always included: it is the keyset cursor for the next page
+    return ["id"] + [name for name in requested if name != "id"]
+
+
+def build_export_query(
+    fields: list[str],
+    after_id: int,
+    limit: int | None,
+    spectral_class: str | None,
+    min_magnitude: float | None,
+    max_magnitude: float | None,
+    min_distance: float | None,
+    max_distance: float | None,
+):
+    """Keyset-paginated projection over `filtered_stars`, ordered by id."""
+    query = select(*(EXPORT_COLUMNS[name] for name in fields)).where(Star.id > after_id)
+    if spectral_class:
+        query = query.where(Star.spectral_type.startswith(spectral_class.upper()))
+    if min_magnitude is not None:
+        query = query.where(Star.magnitude >= min_magnitude)
+    if max_magnitude is not None:
+        query = query.where(Star.magnitude <= max_magnitude)
+    if min_distance is not None:
+        query = query.where(Star.distance >= min_distance)
+    if max_distance is not None:
+        query = query.where(Star.distance <= max_distance)
+    query = query.order_by(Star.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+async def stream_partitions(query):
+    """Yields row batches from a server-side cursor held open for the whole stream."""
+    async with async_session_maker() as session:
+        result = await session.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+
+async def encode_ndjson(query, fields: list[str]):
+    async for rows in stream_partitions(query):
+        yield "".join(
+            json.dumps(dict(zip(fields, row)), default=_json_default) + "\n"
+            for row in rows
+        )
+
+
+async def encode_csv(query, fields: list[str]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for rows in stream_partitions(query):
+        writer.writerows([_encode_document(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _arrow_schema(pa, fields: list[str]):
+    def arrow_type(column):
+        if isinstance(column.type, Integer):
+            return pa.int64()
+        if isinstance(column.type, Float):
+            return pa.float64()
+        if isinstance(column.type, DateTime):
+            return pa.timestamp("us")
+        return pa.string()
+
+    return pa.schema([(name, arrow_type(EXPORT_COLUMNS[name])) for name in fields])
+
+
+async def encode_arrow(query, fields: list[str]):
+    """Arrow IPC stream: schema message, one record batch per partition, EOS."""
+    import pyarrow as pa
+
+    schema = _arrow_schema(pa, fields)
+    yield schema.serialize().to_pybytes()
+    async for rows in stream_partitions(query):
+        columns = list(zip(*rows))
+        arrays = [
+            pa.array([_encode_document(value) for value in values], type=field.type)
+            for values, field in zip(columns, schema)
+        ]
+        yield pa.record_batch(arrays, schema=schema).serialize().to_pybytes()
+    yield ARROW_EOS
+
+
+ENCODERS = {"ndjson": encode_ndjson, "csv": encode_csv, "arrow": encode_arrow}
+
+
+@router.get("/stars")
+async def export_stars(
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv|arrow)$"),
+    fields: str | None = Query(
+        default=None, description="Comma-separated columns; mythology is opt-in"
+    ),
+    after_id: int = Query(
+        default=0, ge=0, description="Return rows with id > after_id"
+    ),
+    limit: int | None = Query(default=None, ge=1),
+    spectral_class: str | None = Query(default=None, pattern="^[OBAFGKMobafgkm]$"),
+    min_magnitude: float | None = None,
+    max_magnitude: float | None = None,
+    min_distance: float | None = None,
+    max_distance: float | None = None,
+):
+    """
+    Lists or exports the star catalog as a stream (NDJSON, CSV or Arrow IPC).
+
+    Rows are read from a server-side cursor in batches, so memory stays flat
+    regardless of catalog size. Pagination is keyset-based: pass the last row's
+    `id` as `after_id` to fetch the next page.
+    """
+    if format == "arrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(
+                status_code=400, detail="Arrow export requires the pyarrow package."
+            )
+
+    selected = _parse_fields(fields)
+    query = build_export_query(
+        selected,
+        after_id,
+        limit,
+        spectral_class,
+        min_magnitude,
+        max_magnitude,
+        min_distance,
+        max_distance,
+    )
+    return StreamingResponse(
+        ENCODERS[format](query, selected), media_type=MEDIA_TYPES[format]
+    )
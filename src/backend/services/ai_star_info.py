@@ -1,29 +1,38 @@
-import openai
-import logging
+import hashlib
 import json
-from src.backend.config.settings import settings
-from src.backend.services.redis_client import redis_client
-
-openai.api_key = settings.OPENAI_API_KEY
-logger = logging.getLogger(__name__)
-
+import logging
+from datetime import datetime, timezone
 
-async def analyze_star_mythology(star_name: str, star_data: dict):
-    """
-    Uses GPT-4 to analyze the mythology of a star.
-    """
+from sqlalchemy import select, update
 
-    if not star_data:
-        return {"error": "Star data not found in SIMBAD API."}
+from src.backend.core.database import async_session_maker
+from src.backend.core.metrics import track_upstream, record_openai_usage
+from src.backend.core.services import services
+from src.backend.core.tracing import span, traced
+from src.backend.models.star import Star
+from src.backend.services import hot_keys
+from src.backend.services.redis_client import redis_client
 
-    cache_key = f"mythology:{star_name}"
-    cached_data = await redis_client.get(cache_key)
+logger = logging.getLogger(__name__)
 
-    if cached_data:
-        logger.info(f"Cache hit for mythology of {star_name}")
-        return json.loads(cached_data)
+# Bump when the stored document layout changes; old cache keys are then ignored
+MYTHOLOGY_VERSION = 1
+MYTHOLOGY_MODEL = "gpt-4o"
+MYTHOLOGY_PARAMS = {
+    "max_tokens": 300,
+    "temperature": 0.6,
+    "top_p": 0.9,
+    "frequency_penalty": 0.2,
+    "presence_penalty": 0.3,
+}
+MYTHOLOGY_SECTIONS = (
+    "mythological_meaning",
+    "emotional_and_symbolic_representation",
+    "if_the_star_were_a_person",
+    "message_for_the_user",
+)
 
-    prompt = f"""
+MYTHOLOGY_PROMPT = """
     You are an expert in astronomy, mythology, and poetic writing. Your task is to create a concise yet poetic 
     and emotionally profound description of the star "{star_name}," 
     analyzing its historical and mythological significance.
@@ -51,46 +60,220 @@ async def analyze_star_mythology(star_name: str, star_data: dict):
         - Keep the text concise and meaningful.
         - Do NOT create fake scientific facts—use only the provided data.
 
-    """
+"""
+
 
-    client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-    response = await client.chat.completions.create(
-        model="gpt-4o",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=300,
-        temperature=0.6,
-        top_p=0.9,
-        frequency_penalty=0.2,
-        presence_penalty=0.3,
+def _prompt_hash() -> str:
+    # Covers everything that shapes the output, so any change triggers regeneration
+    spec = json.dumps(
+        [MYTHOLOGY_VERSION, MYTHOLOGY_MODEL, MYTHOLOGY_PARAMS, MYTHOLOGY_PROMPT],
+        sort_keys=True,
     )
+    return hashlib.sha256(spec.encode()).hexdigest()
+
+
+MYTHOLOGY_PROMPT_HASH = _prompt_hash()
+
+
+def mythology_cache_key(star_name: str) -> str:
+    """Redis hash holding one field per section plus `_`-prefixed metadata."""
+    return f"mythology:v{MYTHOLOGY_VERSION}:{star_name}"
+
+
+def format_mythology_response(mythology_text: str) -> dict:
+    """
+    Splits the model's `**Section**: text` output into a dict keyed by snake_case section.
+    """
+    sections = mythology_text.split("**")
+    mythology = {}
+
+    for i in range(1, len(sections), 2):
+        key = sections[i].strip().lower().replace(" ", "_").replace(":", "")
+        value = sections[i + 1].strip() if i + 1 < len(sections) else ""
+
+        if value.startswith(": "):
+            value = value[2:].strip()
+
+        mythology[key] = value
+
+    return mythology
+
+
+def _select(sections: dict, names) -> dict:
+    return dict(sections) if names is None else {name: sections[name] for name in names}
+
+
+async def generate_mythology(star_name: str) -> dict:
+    """
+    Uses GPT-4o to write the star's mythology.
+
+    Returns:
+        dict: Versioned document with `sections`, `model`, `prompt_hash` and `generated_at`.
+    """
+    with span("openai.chat.completions", model=MYTHOLOGY_MODEL), track_upstream(
+        "openai", "chat.completions"
+    ):
+        response = await services.openai().chat.completions.create(
+            model=MYTHOLOGY_MODEL,
+            messages=[
+                {
+                    "role": "user",
+                    "content": MYTHOLOGY_PROMPT.format(star_name=star_name),
+                }
+            ],
+            **MYTHOLOGY_PARAMS,
+        )
+    record_openai_usage(MYTHOLOGY_MODEL, response.usage)
 
     mythology_description = response.choices[0].message.content.strip()
     mythology_description = mythology_description.replace("\n-", "").strip()
 
-    def format_mythology_response(mythology_text: str):
-        sections = mythology_text.split("**")
-        mythology = {}
+    # Every known section is present, so section reads never miss on a stored doc
+    sections = {name: "" for name in MYTHOLOGY_SECTIONS}
+    sections.update(format_mythology_response(mythology_description))
+
+    return {
+        "version": MYTHOLOGY_VERSION,
+        "sections": sections,
+        "model": MYTHOLOGY_MODEL,
+        "prompt_hash": MYTHOLOGY_PROMPT_HASH,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+async def cache_mythology(star_name: str, document: dict):
+    """Caches the document as a Redis hash: 1 year for hot stars, a month otherwise."""
+    expire = await hot_keys.ttl_for("mythology", star_name)
+    await redis_client.hset(
+        mythology_cache_key(star_name),
+        {
+            **document["sections"],
+            "_version": document["version"],
+            "_model": document["model"],
+            "_prompt_hash": document["prompt_hash"],
+            "_generated_at": document["generated_at"],
+        },
+        expire=expire,
+    )
+    logger.info("Mythology for %s cached for %s seconds", star_name, expire)
+
+
+async def get_cached_mythology(star_name: str, sections=None) -> dict | None:
+    """
+    Reads only the requested sections (all when None) from the Redis hash.
+
+    Returns:
+        dict | None: Sections by name, or None on a miss or stale prompt hash.
+    """
+    key = mythology_cache_key(star_name)
+    if sections is None:
+        fields = await redis_client.hgetall(key)
+        if fields.get("_prompt_hash") != MYTHOLOGY_PROMPT_HASH:
+            return None
+        return {k: v for k, v in fields.items() if not k.startswith("_")}
+
+    values = await redis_client.hmget(key, ["_prompt_hash", *sections])
+    if values[0] != MYTHOLOGY_PROMPT_HASH or None in values:
+        return None
+    return dict(zip(sections, values[1:]))
+
+
+async def load_mythology(db_name: str) -> dict | None:
+    """Full stored document, or None if missing or generated by another prompt."""
+    async with async_session_maker() as session:
+        return await session.scalar(
+            select(Star.mythology).where(
+                Star.name == db_name,
+                Star.mythology["prompt_hash"].as_string() == MYTHOLOGY_PROMPT_HASH,
+            )
+        )
+
+
+async def load_mythology_sections(db_name: str, sections=None) -> dict | None:
+    """
+    Like load_mythology(), but projects only the requested JSONB paths.
+
+    Returns:
+        dict | None: Sections by name, or None if missing or generated by another prompt.
+    """
+    if sections is None:
+        columns = [Star.mythology["sections"]]
+    else:
+        columns = [Star.mythology[("sections", name)].as_string() for name in sections]
+
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(*columns).where(
+                Star.name == db_name,
+                Star.mythology["prompt_hash"].as_string() == MYTHOLOGY_PROMPT_HASH,
+            )
+        )
+        row = result.first()
+
+    if row is None or None in row:
+        return None
+    return row[0] if sections is None else dict(zip(sections, row))
 
-        for i in range(1, len(sections), 2):
-            key = sections[i].strip().lower().replace(" ", "_").replace(":", "")
-            value = sections[i + 1].strip() if i + 1 < len(sections) else ""
 
-            if value.startswith(": "):
-                value = value[2:].strip()
+async def save_mythology(db_name: str, document: dict) -> bool:
+    """
+    Stores the document on the star's row.
+
+    Returns:
+        bool: False if the star is not in the catalog.
+    """
+    async with async_session_maker() as session:
+        result = await session.execute(
+            update(Star)
+            .where(Star.name == db_name)
+            .values(
+                mythology=document, last_mythology_update=datetime.now(timezone.utc)
+            )
+        )
+        await session.commit()
+    return result.rowcount > 0
 
-            mythology[key] = value
 
+@traced("get_mythology")
+async def get_mythology(star_name: str, star_data: dict, sections=None) -> dict:
+    """
+    Returns the requested mythology sections (all when None), trying Redis,
+    then the catalog, and only then generating a new document.
+    """
+    mythology = await get_cached_mythology(star_name, sections)
+    if mythology is not None:
+        logger.debug("Cache hit for mythology of %s", star_name)
         return mythology
 
-    formatted_mythology = format_mythology_response(mythology_description)
+    db_name = star_data.get("name", star_name)
+    if redis_client.redis is None:
+        mythology = await load_mythology_sections(db_name, sections)
+        if mythology is not None:
+            return mythology
+    else:
+        # Load the whole document so the cache is refilled for every section
+        document = await load_mythology(db_name)
+        if document is not None:
+            await cache_mythology(star_name, document)
+            return _select(document["sections"], sections)
 
-    # Cache the response for 1 year (365 days)
-    await redis_client.set(
-        cache_key,
-        json.dumps({**star_data, "mythology": formatted_mythology}),
-        expire=31536000,
-    )
+    document = await generate_mythology(star_name)
+    await save_mythology(db_name, document)
+    await cache_mythology(star_name, document)
+    return _select(document["sections"], sections)
+
+
+@traced("analyze_star_mythology")
+async def analyze_star_mythology(star_name: str, star_data: dict, sections=None):
+    """
+    Adds the star's mythology (optionally only some sections) to its SIMBAD data.
+    """
 
-    logger.info(f" Mythology for {star_name} cached for 1 year")
+    if not star_data:
+        return {"error": "Star data not found in SIMBAD API."}
+    # Nothing to describe: don't spend a completion on a SIMBAD error
+    if "error" in star_data:
+        return star_data
 
-    return {**star_data, "mythology": formatted_mythology}
+    mythology = await get_mythology(star_name, star_data, sections)
+    return {**star_data, "mythology": mythology}
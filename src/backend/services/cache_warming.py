@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import os
+
+from src.backend.services import hot_keys
+from src.backend.services.ai_star_info import get_mythology, mythology_cache_key
+from src.backend.services.redis_client import redis_client
+from src.backend.services.simbad_api import fetch_star_data
+
+logger = logging.getLogger(__name__)
+
+# Hot keys expiring within this many seconds are refreshed ahead of time
+REFRESH_WINDOW = int(os.getenv("CACHE_REFRESH_WINDOW", "172800"))  # 2 days
+WARM_CONCURRENCY = 8
+PREWARM_LIMIT = int(os.getenv("CACHE_PREWARM_LIMIT", "50"))
+
+
+def _needs_refresh(ttl: int) -> bool:
+    # -2: missing, -1: no expiry (never refresh), otherwise seconds remaining
+    return ttl == -2 or 0 <= ttl < REFRESH_WINDOW
+
+
+async def warm_star(star_name: str) -> bool:
+    """
+    Refreshes a hot star's cache entries before they expire.
+    Star data is re-fetched from SIMBAD; missing mythology is reloaded from the
+    catalog (generated only if absent there), otherwise its TTL is extended
+    since the text does not go stale.
+
+    Returns:
+        bool: True if anything was refreshed.
+    """
+    star_ttl = await redis_client.ttl(f"star:{star_name}")
+    mythology_key = mythology_cache_key(star_name)
+    mythology_ttl = await redis_client.ttl(mythology_key)
+    refreshed = False
+
+    star_data = None
+    if _needs_refresh(star_ttl):
+        star_data = await fetch_star_data(star_name, refresh=True)
+        if not star_data or "error" in star_data:
+            # SIMBAD does not know the name; stop warming it on every run
+            await hot_keys.forget(star_name)
+            return False
+        refreshed = True
+
+    if mythology_ttl == -2:
+        star_data = star_data or await fetch_star_data(star_name)
+        if star_data and "error" not in star_data:
+            await get_mythology(star_name, star_data)
+            refreshed = True
+    elif _needs_refresh(mythology_ttl):
+        await redis_client.expire(mythology_key, hot_keys.HOT_TTLS["mythology"])
+        refreshed = True
+
+    return refreshed
+
+
+async def warm_hot_keys(limit: int = hot_keys.TOP_K) -> int:
+    """
+    Refreshes the cache for the hottest stars.
+
+    Returns:
+        int: Number of stars whose cache entries were refreshed.
+    """
+    hottest = await hot_keys.hottest(limit)
+    semaphore = asyncio.Semaphore(WARM_CONCURRENCY)
+
+    async def warm(star_name: str) -> bool:
+        async with semaphore:
+            try:
+                return await warm_star(star_name)
+            except Exception as e:
+                logger.warning("Cache warming failed for %s: %s", star_name, e)
+                return False
+
+    results = await asyncio.gather(*(warm(name) for name, _ in hottest))
+    refreshed = sum(results)
+    logger.info("Warmed %d of %d hot stars", refreshed, len(hottest))
+    return refreshed
@@ -0,0 +1,66 @@
+import json
+import logging
+
+from src.backend.core.metrics import FLOW_DURATION, FLOW_ITEMS
+from src.backend.services.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Flows run in the Prefect worker, so their metrics are summed in a Redis hash
+# that the API's /metrics endpoint reads back
+FLOW_METRICS_KEY = "metrics:flows"
+FLOW_FAMILIES = (FLOW_ITEMS, FLOW_DURATION)
+
+# Sample values already published by this process; pushes only add the delta
+_published = {}
+
+
+def _field(metric, values: tuple, sample: str) -> str:
+    return json.dumps([metric.name, list(values), sample])
+
+
+async def publish_flow_metrics():
+    """Adds this process's flow metric increments to the shared Redis hash."""
+    pipe = redis_client.pipeline()
+    if pipe is None:
+        logger.debug("Redis unavailable; flow metrics not published")
+        return
+
+    current = {
+        _field(metric, values, sample): value
+        for metric in FLOW_FAMILIES
+        for values, samples in metric.samples().items()
+        for sample, value in samples.items()
+    }
+    changed = {
+        field: value
+        for field, value in current.items()
+        if value != _published.get(field, 0)
+    }
+    if not changed:
+        return
+    for field, value in changed.items():
+        pipe.hincrbyfloat(FLOW_METRICS_KEY, field, value - _published.get(field, 0))
+    await redis_client.execute(pipe)
+    _published.update(changed)
+
+
+async def load_flow_metrics():
+    """
+    Mirrors the published totals into this process's flow metric families.
+    Only for the API process, which never records flow metrics itself.
+    """
+    pipe = redis_client.pipeline()
+    if pipe is None:
+        return
+    pipe.hgetall(FLOW_METRICS_KEY)
+    (fields,) = await redis_client.execute(pipe)
+
+    families = {metric.name: metric for metric in FLOW_FAMILIES}
+    children = {}
+    for field, value in fields.items():
+        name, values, sample = json.loads(field)
+        if name in families:
+            children.setdefault((name, tuple(values)), {})[sample] = float(value)
+    for (name, values), samples in children.items():
+        families[name].set_samples(values, samples)
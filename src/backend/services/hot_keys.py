@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+import logging
+import os
+
+from src.backend.services.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Count-min sketch stored as one Redis hash with DEPTH x WIDTH counters
+SKETCH_KEY = "hotkeys:cms"
+SKETCH_WIDTH = 2048
+SKETCH_DEPTH = 4
+
+# Sorted set of the most requested stars, scored by their sketch estimate
+TOP_KEY = "hotkeys:top"
+TOP_K = int(os.getenv("HOT_KEYS_TOP_K", "200"))
+
+# TTLs per keyspace: hot stars keep long TTLs, the rest age out sooner
+HOT_TTLS = {
+    "star": 2_592_000,  # 1 month
+    "mythology": 31_536_000,  # 1 year
+    "music": 2_592_000,  # 1 month
+}
+COLD_TTLS = {
+    "star": 86_400,  # 1 day
+    "mythology": 2_592_000,  # 1 month
+    "music": 86_400,  # 1 day
+}
+
+# Keep references to fire-and-forget tasks so they are not garbage collected
+_pending = set()
+
+
+def sketch_fields(star_name: str) -> list[str]:
+    """Hash fields (`row:column`) of the star's counter in each sketch row."""
+    digest = hashlib.blake2b(star_name.encode(), digest_size=8 * SKETCH_DEPTH).digest()
+    return [
+        f"{row}:{int.from_bytes(digest[row * 8:(row + 1) * 8], 'little') % SKETCH_WIDTH}"
+        for row in range(SKETCH_DEPTH)
+    ]
+
+
+async def record_access(star_name: str):
+    """
+    Counts one request for the star in the sketch and updates the top-k set.
+    Two pipelined round trips: increment counters, then publish the estimate.
+    """
+    pipe = redis_client.pipeline()
+    if pipe is None:
+        return
+    for field in sketch_fields(star_name):
+        pipe.hincrby(SKETCH_KEY, field, 1)
+    counts = await redis_client.execute(pipe)
+
+    pipe = redis_client.pipeline()
+    pipe.zadd(TOP_KEY, {star_name: min(counts)})
+    pipe.zremrangebyrank(TOP_KEY, 0, -(TOP_K + 1))
+    await redis_client.execute(pipe)
+
+
+def track_access(star_name: str):
+    """Schedules record_access() without delaying the request."""
+
+    async def run():
+        try:
+            await record_access(star_name)
+        except Exception as e:
+            logger.warning("Hot key tracking failed for %s: %s", star_name, e)
+
+    task = asyncio.create_task(run())
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def hottest(limit: int = TOP_K) -> list[tuple[str, float]]:
+    """Most requested stars with their estimated counts, hottest first."""
+    return await redis_client.zrevrange(TOP_KEY, 0, limit - 1, withscores=True)
+
+
+async def is_hot(star_name: str) -> bool:
+    return await redis_client.zscore(TOP_KEY, star_name) is not None
+
+
+async def forget(star_name: str):
+    """Drops a star from the top-k set (e.g. a name SIMBAD does not know)."""
+    await redis_client.zrem(TOP_KEY, star_name)
+
+
+async def ttl_for(keyspace: str, star_name: str) -> int:
+    """Cache TTL for a star's key: long for top-k stars, short otherwise."""
+    if await is_hot(star_name):
+        return HOT_TTLS[keyspace]
+    return COLD_TTLS[keyspace]
+
+
+async def decay():
+    """
+    Halves all counters so popularity reflects recent traffic.
+
+    Counters are read once, then decremented by half their value in one
+    MULTI/EXEC transaction. Relative updates keep any HINCRBY/ZADD from live
+    traffic that lands in between; top-k members that reach zero are dropped.
+    Zeroed sketch counters are kept, the sketch has a fixed number of fields.
+    """
+    pipe = redis_client.pipeline()
+    if pipe is None:
+        return
+    pipe.hgetall(SKETCH_KEY)
+    pipe.zrange(TOP_KEY, 0, -1, withscores=True)
+    counters, top = await redis_client.execute(pipe)
+
+    pipe = redis_client.pipeline(transaction=True)
+    for field, count in counters.items():
+        count = int(count)
+        if count:
+            pipe.hincrby(SKETCH_KEY, field, -(count - count // 2))
+    for name, score in top:
+        score = int(score)
+        if score:
+            pipe.zincrby(TOP_KEY, -(score - score // 2), name)
+    pipe.zremrangebyscore(TOP_KEY, "-inf", 0)
+    await redis_client.execute(pipe)
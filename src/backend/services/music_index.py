@@ -0,0 +1,205 @@
+import hashlib
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Built by the music ingestion flow and loaded by the API at startup
+MUSIC_INDEX_PATH = os.getenv(
+    "MUSIC_INDEX_PATH", os.path.join("data", "music_index.npz")
+)
+
+# Audio features in index column order; all but tempo are already in [0, 1]
+FEATURES = ("valence", "energy", "tempo", "acousticness")
+TEMPO_INDEX = FEATURES.index("tempo")
+TEMPO_RANGE = (60.0, 200.0)  # BPM mapped onto [0, 1]
+
+# Upper bound on query x track pairs held in one distance matrix
+DISTANCE_BATCH_LIMIT = 20_000_000
+
+# Tracks sampled per requested neighbour to bound the k-th nearest distance
+SAMPLE_RATIO = 64
+
+
+def normalize_features(features: np.ndarray) -> np.ndarray:
+    """Scales raw (N, 4) audio features into the unit cube used for matching."""
+    normalized = np.array(features, dtype=np.float32, copy=True)
+    low, high = TEMPO_RANGE
+    normalized[:, TEMPO_INDEX] = (normalized[:, TEMPO_INDEX] - low) / (high - low)
+    return np.clip(normalized, 0.0, 1.0)
+
+
+class MusicIndex:
+    """
+    Static nearest-neighbour index over track audio features.
+
+    Features are kept as a float32 (N, 4) matrix in the unit cube. A batch of
+    target vectors is matched with one matrix product per chunk, using
+    |a - b|^2 = |a|^2 + |b|^2 - 2ab, followed by a partial sort per row.
+    """
+
+    def __init__(
+        self,
+        track_ids: np.ndarray,
+        names: np.ndarray,
+        artists: np.ndarray,
+        features: np.ndarray,
+    ):
+        self.track_ids = np.asarray(track_ids, dtype=object)
+        self.names = np.asarray(names, dtype=object)
+        self.artists = np.asarray(artists, dtype=object)
+        self.features = np.asarray(features, dtype=np.float32).reshape(
+            -1, len(FEATURES)
+        )
+        self.vectors = normalize_features(self.features)
+        self._norms = np.einsum("ij,ij->i", self.vectors, self.vectors)
+        self._sample_columns = None
+        # Identifies the track set, so cached recommendations follow re-ingestion
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update("\n".join(self.track_ids.astype(str)).encode())
+        digest.update(self.features.tobytes())
+        self.version = digest.hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+    @classmethod
+    def from_tracks(cls, tracks: list[dict]) -> "MusicIndex":
+        """Builds the index from tracks as returned by fetch_tracks_with_features()."""
+        return cls(
+            np.array([track["id"] for track in tracks], dtype=object),
+            np.array([track["name"] for track in tracks], dtype=object),
+            np.array([track["artists"] for track in tracks], dtype=object),
+            np.array(
+                [[track[name] for name in FEATURES] for track in tracks],
+                dtype=np.float32,
+            ),
+        )
+
+    def nearest(self, targets, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the `k` tracks closest to each target vector (normalized features).
+
+        Returns:
+            tuple: (track indices, euclidean distances), both (M, k), nearest first.
+        """
+        targets = np.atleast_2d(np.asarray(targets, dtype=np.float32))
+        k = min(k, len(self))
+        indices = np.empty((len(targets), k), dtype=np.int64)
+        distances = np.empty((len(targets), k), dtype=np.float32)
+        if k == 0:
+            return indices, distances
+
+        chunk = max(1, DISTANCE_BATCH_LIMIT // len(self))
+        for start in range(0, len(targets), chunk):
+            block = targets[start : start + chunk]
+            # |b|^2 - 2ab ranks tracks like the squared distance; |a|^2 is added back below
+            scores = self._norms[None, :] - 2.0 * (block @ self.vectors.T)
+            top, top_scores = self._top_k(scores, k)
+            squared = top_scores + np.einsum("ij,ij->i", block, block)[:, None]
+            indices[start : start + len(block)] = top
+            distances[start : start + len(block)] = np.sqrt(np.maximum(squared, 0.0))
+        return indices, distances
+
+    def _top_k(self, scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Row-wise `k` smallest scores, sorted. The k-th smallest score within a
+        fixed sample of tracks bounds the true k-th smallest from above, so only
+        tracks under that bound need ranking.
+        """
+        if k * SAMPLE_RATIO >= len(self):
+            top = np.argpartition(scores, k - 1, axis=1)[:, :k]
+        else:
+            sample = self._sample(k * SAMPLE_RATIO)
+            bound = np.partition(scores[:, sample], k - 1, axis=1)[:, k - 1]
+            flat = np.flatnonzero(scores <= bound[:, None])
+            rows, cols = np.divmod(flat, len(self))
+            # Scores lie in [-8, 4] (unit cube), so this key sorts by row, then score
+            order = np.argsort(rows * 16.0 + scores.ravel()[flat])
+            rows, cols = rows[order], cols[order]
+            # Every row has at least k candidates: the sample's own k best
+            rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+            keep = rank < k
+            top = np.empty((len(scores), k), dtype=np.int64)
+            top[rows[keep], rank[keep]] = cols[keep]
+            return top, np.take_along_axis(scores, top, axis=1)
+
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(top_scores, axis=1, kind="stable")
+        return (
+            np.take_along_axis(top, order, axis=1),
+            np.take_along_axis(top_scores, order, axis=1),
+        )
+
+    def _sample(self, size: int) -> np.ndarray:
+        if self._sample_columns is None or len(self._sample_columns) != size:
+            rng = np.random.default_rng(0)
+            self._sample_columns = np.sort(rng.choice(len(self), size, replace=False))
+        return self._sample_columns
+
+    def track(self, i: int) -> dict:
+        """Serializes one track with its raw audio features."""
+        track = {
+            "id": self.track_ids[i],
+            "name": self.names[i],
+            "artists": self.artists[i],
+        }
+        for name, value in zip(FEATURES, self.features[i]):
+            track[name] = round(float(value), 3)
+        return track
+
+    def save(self, path: str = MUSIC_INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Written aside and renamed so a running API never loads a partial file
+        partial = f"{path}.partial.npz"
+        np.savez(
+            partial,
+            track_ids=self.track_ids.astype(str),
+            names=self.names.astype(str),
+            artists=self.artists.astype(str),
+            features=self.features,
+        )
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str = MUSIC_INDEX_PATH) -> "MusicIndex":
+        with np.load(path) as data:
+            return cls(
+                data["track_ids"], data["names"], data["artists"], data["features"]
+            )
+
+
+class MusicIndexStore:
+    """Holds the process-wide index; it is only ever built by the ingestion flow."""
+
+    def __init__(self, path: str = MUSIC_INDEX_PATH):
+        self.path = path
+        self.index = None
+        self._mtime = None
+
+    async def get(self) -> MusicIndex | None:
+        """The current index, reloaded if the flow has replaced the file; None if absent."""
+        if not os.path.exists(self.path):
+            return self.index
+        if self.index is None or os.path.getmtime(self.path) != self._mtime:
+            self.load()
+        return self.index
+
+    def load(self):
+        mtime = os.path.getmtime(self.path)
+        self.index = MusicIndex.load(self.path)
+        self._mtime = mtime
+        logger.info("Loaded music index with %d tracks", len(self.index))
+
+    def replace(self, index: MusicIndex):
+        """Persists a freshly built index and makes it current."""
+        index.save(self.path)
+        self.index = index
+        self._mtime = os.path.getmtime(self.path)
+        logger.info("Saved music index with %d tracks", len(index))
+
+
+# Singleton instance
+music_index_store = MusicIndexStore()
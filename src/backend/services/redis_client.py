@@ -1,9 +1,25 @@
-import aioredis
 import logging
+import time
 from src.backend.config.settings import settings
+from src.backend.core.metrics import upstream_metrics, record_cache_lookup
+from src.backend.core.tracing import span
 
 logger = logging.getLogger(__name__)
 
+# Bound once: every cache call is timed inline (see UpstreamMetrics)
+REDIS_SET = upstream_metrics("redis", "set")
+REDIS_GET = upstream_metrics("redis", "get")
+REDIS_MGET = upstream_metrics("redis", "mget")
+REDIS_HSET = upstream_metrics("redis", "hset")
+REDIS_HMGET = upstream_metrics("redis", "hmget")
+REDIS_HGETALL = upstream_metrics("redis", "hgetall")
+REDIS_TTL = upstream_metrics("redis", "ttl")
+REDIS_EXPIRE = upstream_metrics("redis", "expire")
+REDIS_ZSCORE = upstream_metrics("redis", "zscore")
+REDIS_ZREVRANGE = upstream_metrics("redis", "zrevrange")
+REDIS_ZREM = upstream_metrics("redis", "zrem")
+REDIS_PIPELINE = upstream_metrics("redis", "pipeline")
+
 
 class RedisClient:
     def __init__(self):
@@ -11,28 +27,201 @@ class RedisClient:
 
     async def connect(self):
         """Initialize Redis connection."""
+        # Imported here so the app can run against an in-memory stand-in without it
+        import aioredis
+
         self.redis = await aioredis.from_url(settings.REDIS_URL, decode_responses=True)
         logger.info("Connected to Redis")
 
     async def set(self, key: str, value: str, expire: int = 3600):
         """Set a value in Redis with an expiration time."""
         if self.redis:
-            await self.redis.set(key, value, ex=expire)
-            logger.info(f" Cached {key} for {expire} seconds")
+            with span("redis.set", key=key):
+                start = time.perf_counter()
+                try:
+                    await self.redis.set(key, value, ex=expire)
+                except Exception:
+                    REDIS_SET.fail()
+                    raise
+                finally:
+                    REDIS_SET.observe(start)
+            logger.debug("Cached %s for %s seconds", key, expire)
 
     async def get(self, key: str):
         """Get a value from Redis."""
         if self.redis:
-            value = await self.redis.get(key)
+            with span("redis.get", key=key):
+                start = time.perf_counter()
+                try:
+                    value = await self.redis.get(key)
+                except Exception:
+                    REDIS_GET.fail()
+                    raise
+                finally:
+                    REDIS_GET.observe(start)
+            record_cache_lookup(key, bool(value))
             if value:
-                logger.info(f" Cache hit for {key}")
+                logger.debug("Cache hit for %s", key)
+            return value
+        return None
+
+    async def mget(self, keys: list[str]) -> list:
+        """Get many values in one round trip; missing keys come back as None."""
+        if self.redis:
+            with span("redis.mget", keys=len(keys)):
+                start = time.perf_counter()
+                try:
+                    values = await self.redis.mget(keys)
+                except Exception:
+                    REDIS_MGET.fail()
+                    raise
+                finally:
+                    REDIS_MGET.observe(start)
+            for key, value in zip(keys, values):
+                record_cache_lookup(key, bool(value))
+            return values
+        return [None] * len(keys)
+
+    async def hset(self, key: str, mapping: dict, expire: int = 3600):
+        """Replace a hash with `mapping` and set its expiration time."""
+        if self.redis:
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.delete(key)
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, expire)
+            with span("redis.hset", key=key):
+                start = time.perf_counter()
+                try:
+                    await pipe.execute()
+                except Exception:
+                    REDIS_HSET.fail()
+                    raise
+                finally:
+                    REDIS_HSET.observe(start)
+            logger.debug("Cached hash %s for %s seconds", key, expire)
+
+    async def hmget(self, key: str, fields: list[str]) -> list:
+        """Get selected hash fields; missing fields (or key) come back as None."""
+        if self.redis:
+            with span("redis.hmget", key=key):
+                start = time.perf_counter()
+                try:
+                    values = await self.redis.hmget(key, fields)
+                except Exception:
+                    REDIS_HMGET.fail()
+                    raise
+                finally:
+                    REDIS_HMGET.observe(start)
+            record_cache_lookup(key, all(value is not None for value in values))
+            return values
+        return [None] * len(fields)
+
+    async def hgetall(self, key: str) -> dict:
+        """Get all fields of a hash (empty dict if missing)."""
+        if self.redis:
+            with span("redis.hgetall", key=key):
+                start = time.perf_counter()
+                try:
+                    value = await self.redis.hgetall(key)
+                except Exception:
+                    REDIS_HGETALL.fail()
+                    raise
+                finally:
+                    REDIS_HGETALL.observe(start)
+            record_cache_lookup(key, bool(value))
             return value
+        return {}
+
+    async def ttl(self, key: str) -> int:
+        """Remaining TTL in seconds (-1 without expiry, -2 if the key is missing)."""
+        if self.redis:
+            start = time.perf_counter()
+            try:
+                return await self.redis.ttl(key)
+            except Exception:
+                REDIS_TTL.fail()
+                raise
+            finally:
+                REDIS_TTL.observe(start)
+        return -2
+
+    async def expire(self, key: str, expire: int) -> bool:
+        """Reset the expiration time of an existing key."""
+        if self.redis:
+            start = time.perf_counter()
+            try:
+                return await self.redis.expire(key, expire)
+            except Exception:
+                REDIS_EXPIRE.fail()
+                raise
+            finally:
+                REDIS_EXPIRE.observe(start)
+        return False
+
+    async def zscore(self, key: str, member: str) -> float | None:
+        """Score of a sorted-set member (None if absent)."""
+        if self.redis:
+            start = time.perf_counter()
+            try:
+                return await self.redis.zscore(key, member)
+            except Exception:
+                REDIS_ZSCORE.fail()
+                raise
+            finally:
+                REDIS_ZSCORE.observe(start)
         return None
 
+    async def zrevrange(self, key: str, start: int, end: int, withscores=False):
+        """Sorted-set members by descending score, optionally with their scores."""
+        if self.redis:
+            started = time.perf_counter()
+            try:
+                return await self.redis.zrevrange(
+                    key, start, end, withscores=withscores
+                )
+            except Exception:
+                REDIS_ZREVRANGE.fail()
+                raise
+            finally:
+                REDIS_ZREVRANGE.observe(started)
+        return []
+
+    async def zrem(self, key: str, *members: str) -> int:
+        """Remove members from a sorted set."""
+        if self.redis:
+            start = time.perf_counter()
+            try:
+                return await self.redis.zrem(key, *members)
+            except Exception:
+                REDIS_ZREM.fail()
+                raise
+            finally:
+                REDIS_ZREM.observe(start)
+        return 0
+
+    def pipeline(self, transaction: bool = False):
+        """
+        Pipeline for batching commands into one round trip; with `transaction`
+        the commands run atomically (MULTI/EXEC).
+        """
+        return self.redis.pipeline(transaction=transaction) if self.redis else None
+
+    async def execute(self, pipe) -> list:
+        """Runs a pipeline from pipeline(), timed as one `pipeline` call."""
+        start = time.perf_counter()
+        try:
+            return await pipe.execute()
+        except Exception:
+            REDIS_PIPELINE.fail()
+            raise
+        finally:
+            REDIS_PIPELINE.observe(start)
+
     async def close(self):
         """Close Redis connection."""
         if self.redis:
             await self.redis.close()
+            self.redis = None
             logger.info(" Redis connection closed")
 
 
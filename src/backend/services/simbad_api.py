@@ -1,17 +1,24 @@
-import aiohttp
 import logging
+import os
 import re
 import json
-from src.backend.core.database import get_session
+from src.backend.core.database import async_session_maker
+from src.backend.core.metrics import track_upstream
+from src.backend.core.services import services
+from src.backend.core.tracing import span, traced
 from src.backend.models.star import Star
+from src.backend.services import hot_keys
 from src.backend.services.redis_client import redis_client
+from src.backend.services.sky_index import parse_coordinates, sky_index_store
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
 
-# Enable logging
-logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
-# SIMBAD API URLs
-SIMBAD_SCRIPT_URL = "https://simbad.u-strasbg.fr/simbad/sim-script"
+# SIMBAD API URLs (the script URL can point at a local stand-in for benchmarks)
+SIMBAD_SCRIPT_URL = os.getenv(
+    "SIMBAD_SCRIPT_URL", "https://simbad.u-strasbg.fr/simbad/sim-script"
+)
 SIMBAD_ID_URL = "https://simbad.u-strasbg.fr/simbad/sim-id"
 
 # Spectral class temperature mapping
@@ -54,18 +61,28 @@ async def query_simbad(star_name: str) -> dict | None:
     """
     Fetches star data from SIMBAD using sim-script and parses the response.
     """
-    logging.info(f"Sending request to SIMBAD for {star_name}")
+    logger.debug("Sending request to SIMBAD for %s", star_name)
     script = f"""
     output console=off
     query id {star_name}
     """
-    async with aiohttp.ClientSession() as session:
-        async with session.post(SIMBAD_SCRIPT_URL, data={"script": script}) as response:
-            logging.info(f"SIMBAD response status: {response.status}")
+    with span("simbad.sim-script", star_name=star_name), track_upstream(
+        "simbad", "sim-script"
+    ) as call:
+        async with services.http().post(
+            SIMBAD_SCRIPT_URL, data={"script": script}
+        ) as response:
+            logger.debug("SIMBAD response status: %s", response.status)
             text = await response.text()
             if response.status == 200:
+                # Unknown identifiers come back as an error block with a 200
+                if text.lstrip().startswith("::error::"):
+                    return None
                 return parse_simbad_response(text)
-            logging.warning(f"SIMBAD returned status {response.status} for {star_name}")
+            call.fail()
+            logger.warning(
+                "SIMBAD returned status %s for %s", response.status, star_name
+            )
             return None
 
 
@@ -78,7 +95,7 @@ def parse_simbad_response(response_text: str) -> dict:
             r"typed ident:\s+(.+)", response_text, default="Unknown"
         ),
         "coordinates": extract_value(
-            r"coord\s+:\s+([\d\s.-]+)\s+\([\w\s]+\)", response_text
+            r"coord\s+:\s+([\d\s.+-]+)\s+\([\w\s]+\)", response_text
         ),
         "spectral_type": extract_value(r"Spectral type:\s+([\w.-]+)", response_text),
         "visual_magnitude": extract_float(
@@ -157,23 +174,63 @@ def is_valid_star(star_data: dict) -> bool:
     return True
 
 
-async def fetch_star_data(star_name: str) -> dict:
+@traced("fetch_star_data")
+async def fetch_star_data(star_name: str, refresh: bool = False) -> dict:
     """
     Fetches detailed star data from SIMBAD, caches it in Redis, and stores in PostgreSQL if valid.
+    With `refresh=True` the cache is bypassed and rewritten (used by cache warming).
     """
     # Check Redis cache first
-    cached_data = await redis_client.get(f"star:{star_name}")
-    if cached_data:
-        logging.info(f"✅ Returning cached data for {star_name}")
-        return json.loads(cached_data)
+    if not refresh:
+        cached_data = await redis_client.get(f"star:{star_name}")
+        if cached_data:
+            logger.debug("✅ Returning cached data for %s", star_name)
+            return json.loads(cached_data)
 
-    logging.info(f"Fetching data for {star_name}")
+    logger.debug("Fetching data for %s", star_name)
     data = await query_simbad(star_name)
     if not data:
         return {"error": f"Star '{star_name}' not found in SIMBAD."}
 
-    # Process data
-    star_data = {
+    star_data = enrich_star_data(data)
+
+    # Save to Redis cache (a month for hot stars, a day otherwise)
+    await redis_client.set(
+        f"star:{star_name}",
+        json.dumps(star_data),
+        expire=await hot_keys.ttl_for("star", star_name),
+    )
+
+    # Store in PostgreSQL
+    async with async_session_maker() as session:
+        existing_star = await session.execute(
+            select(Star.id).where(Star.name == star_data["name"])
+        )
+
+        if existing_star.scalar() is None:
+            record = to_star_record(star_data)
+            session.add(Star(**record))
+            try:
+                await session.commit()
+                logger.info("✅ Star %s added to database.", star_name)
+                if record["ra"] is not None:
+                    sky_index_store.add(
+                        record["name"], record["ra"], record["dec"], record["magnitude"]
+                    )
+            except IntegrityError:
+                # A concurrent request for the same star stored it first
+                await session.rollback()
+                logger.debug("Star %s was already stored", star_name)
+
+    return star_data
+
+
+def enrich_star_data(data: dict) -> dict:
+    """
+    Builds the API star payload from a parsed SIMBAD response, adding derived
+    temperature, color, luminosity class and distance.
+    """
+    return {
         "name": data["main_id"],
         "coordinates": data.get("coordinates"),
         "spectral_type": data.get("spectral_type"),
@@ -187,22 +244,18 @@ async def fetch_star_data(star_name: str) -> dict:
         "distance_light_years": calculate_distance(data.get("parallax")),
     }
 
-    # Save to Redis cache
-    await redis_client.set(
-        f"star:{star_name}", json.dumps(star_data), ex=2592000
-    )  # Cache for month
-
-    # Store in PostgreSQL
-    async with get_session() as session:
-        existing_star = await session.execute(
-            select(Star).where(Star.name == star_name)
-        )
-        existing_star = existing_star.scalars().first()
-
-        if not existing_star:
-            new_star = Star(**star_data)
-            session.add(new_star)
-            await session.commit()
-            logging.info(f"✅ Star {star_name} added to database.")
 
-    return star_data
+def to_star_record(star_data: dict) -> dict:
+    """Maps the API star payload onto `Star` column names."""
+    ra, dec = parse_coordinates(star_data.get("coordinates")) or (None, None)
+    return {
+        "name": star_data["name"],
+        "spectral_type": star_data.get("spectral_type"),
+        "magnitude": star_data.get("visual_magnitude"),
+        "color": star_data.get("color"),
+        "temperature": star_data.get("estimated_temperature"),
+        "distance": star_data.get("distance_light_years"),
+        "coordinates": star_data.get("coordinates"),
+        "ra": ra,
+        "dec": dec,
+    }
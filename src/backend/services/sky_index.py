@@ -0,0 +1,339 @@
+import logging
+import math
+import os
+import re
+import time
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import select
+
+from src.backend.core.database import async_session_maker
+from src.backend.models.star import Star
+
+logger = logging.getLogger(__name__)
+
+# The index is rebuilt from the catalog and persisted next to it
+SKY_INDEX_PATH = os.getenv("SKY_INDEX_PATH", os.path.join("data", "sky_index.npz"))
+
+# Number of equal-area declination bands; each band has 2x as many RA bins
+SKY_INDEX_BANDS = 64
+
+# Minimum seconds between catalog rebuilds triggered by newly added stars (or
+# by an empty index that is not persisted)
+REBUILD_INTERVAL = float(os.getenv("SKY_INDEX_REBUILD_INTERVAL", "30"))
+
+# Above this many query x star pairs, batch queries go through the pixel index
+# instead of one dense matrix product
+DENSE_BATCH_LIMIT = 20_000_000
+
+SEXAGESIMAL_PATTERN = re.compile(
+    r"^\s*(\d{1,2})\s+(\d{1,2})\s+([\d.]+)\s+([+-]?)(\d{1,2})\s+(\d{1,2})\s+([\d.]+)"
+)
+
+
+def parse_coordinates(coordinates: str | None) -> tuple[float, float] | None:
+    """
+    Parses SIMBAD ICRS coordinates ("hh mm ss.s +dd mm ss.s") into degrees.
+
+    Returns:
+        tuple | None: (ra, dec) in degrees, or None if the string can't be parsed.
+    """
+    if not coordinates:
+        return None
+    match = SEXAGESIMAL_PATTERN.match(coordinates)
+    if not match:
+        return None
+    hours, minutes, seconds, sign, degrees, arcmin, arcsec = match.groups()
+    ra = (int(hours) + int(minutes) / 60 + float(seconds) / 3600) * 15
+    dec = int(degrees) + int(arcmin) / 60 + float(arcsec) / 3600
+    return ra, -dec if sign == "-" else dec
+
+
+def radec_to_vectors(ra, dec) -> np.ndarray:
+    """Converts RA/Dec in degrees (scalars or arrays) to (N, 3) unit vectors."""
+    ra = np.radians(np.atleast_1d(np.asarray(ra, dtype=np.float64)))
+    dec = np.radians(np.atleast_1d(np.asarray(dec, dtype=np.float64)))
+    cos_dec = np.cos(dec)
+    return np.column_stack((cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)))
+
+
+def local_sidereal_time(longitude, at: datetime) -> np.ndarray:
+    """Local sidereal time in degrees for east-positive longitudes (degrees)."""
+    julian_date = at.timestamp() / 86400.0 + 2440587.5
+    gmst = 280.46061837 + 360.98564736629 * (julian_date - 2451545.0)
+    return np.mod(gmst + np.asarray(longitude, dtype=np.float64), 360.0)
+
+
+class SkyIndex:
+    """
+    Static spatial index over star positions.
+
+    Stars are stored as 3D unit vectors and bucketed into an equal-area grid
+    (declination bands of equal height in sin(dec), each split into RA bins).
+    A cone query only tests stars in the pixels overlapping the cone's bounding
+    box; an angular distance check is then a dot product against cos(radius).
+    """
+
+    def __init__(
+        self,
+        names: np.ndarray,
+        ra: np.ndarray,
+        dec: np.ndarray,
+        magnitudes: np.ndarray,
+        bands: int = SKY_INDEX_BANDS,
+    ):
+        self.bands = bands
+        self.ra_bins = 2 * bands
+
+        pixels = self._pixels(ra, dec)
+        order = np.argsort(pixels, kind="stable")
+        self.names = np.asarray(names, dtype=object)[order]
+        self.ra = np.asarray(ra, dtype=np.float64)[order]
+        self.dec = np.asarray(dec, dtype=np.float64)[order]
+        self.magnitudes = np.asarray(magnitudes, dtype=np.float64)[order]
+        self.vectors = radec_to_vectors(self.ra, self.dec)
+        # offsets[p]:offsets[p + 1] is the slice of stars in pixel p
+        self.offsets = np.searchsorted(
+            pixels[order], np.arange(bands * self.ra_bins + 1)
+        )
+        self._positions = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _band(self, dec) -> np.ndarray:
+        z = np.sin(np.radians(dec))
+        return np.clip(((z + 1) / 2 * self.bands).astype(np.int64), 0, self.bands - 1)
+
+    def _ra_bin(self, ra) -> np.ndarray:
+        ra_bin = (np.mod(ra, 360.0) / 360.0 * self.ra_bins).astype(np.int64)
+        return np.clip(ra_bin, 0, self.ra_bins - 1)
+
+    def _pixels(self, ra, dec) -> np.ndarray:
+        return self._band(dec) * self.ra_bins + self._ra_bin(ra)
+
+    def with_stars(self, stars: list[tuple]) -> "SkyIndex":
+        """A new index that also holds `stars` as (name, ra, dec, magnitude)."""
+        stars = [star for star in stars if star[0] not in self._positions]
+        if not stars:
+            return self
+        names, ra, dec, magnitudes = zip(*stars)
+        magnitudes = [np.nan if m is None else m for m in magnitudes]
+        return SkyIndex(
+            np.concatenate([self.names, np.array(names, dtype=object)]),
+            np.concatenate([self.ra, ra]),
+            np.concatenate([self.dec, dec]),
+            np.concatenate([self.magnitudes, np.array(magnitudes, dtype=np.float64)]),
+            bands=self.bands,
+        )
+
+    def position(self, name: str) -> tuple[float, float] | None:
+        i = self._positions.get(name)
+        return None if i is None else (float(self.ra[i]), float(self.dec[i]))
+
+    def _candidates(self, ra: float, dec: float, radius: float) -> np.ndarray:
+        """Indices of stars in pixels overlapping the cone's bounding box."""
+        dec_min, dec_max = max(dec - radius, -90.0), min(dec + radius, 90.0)
+        first_band, last_band = self._band(np.array([dec_min, dec_max]))
+
+        if dec_max >= 90.0 or dec_min <= -90.0:
+            half_width = 180.0
+        else:
+            ratio = math.sin(math.radians(radius)) / math.cos(math.radians(dec))
+            half_width = 180.0 if ratio >= 1 else math.degrees(math.asin(ratio))
+
+        # A band wider than all but one RA bin would wrap onto itself
+        if half_width >= 180.0 - 180.0 / self.ra_bins:
+            bin_ranges = [(0, self.ra_bins - 1)]
+        else:
+            lo, hi = self._ra_bin(np.array([ra - half_width, ra + half_width]))
+            bin_ranges = [(lo, hi)] if lo <= hi else [(lo, self.ra_bins - 1), (0, hi)]
+
+        slices = []
+        for band in range(int(first_band), int(last_band) + 1):
+            row = band * self.ra_bins
+            for lo, hi in bin_ranges:
+                start, stop = self.offsets[row + lo], self.offsets[row + hi + 1]
+                if stop > start:
+                    slices.append(np.arange(start, stop))
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def cone_search(
+        self, ra: float, dec: float, radius: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Finds stars within `radius` degrees of (ra, dec).
+
+        Returns:
+            tuple: (star indices, angular separations in degrees), nearest first.
+        """
+        candidates = self._candidates(ra, dec, radius)
+        center = radec_to_vectors(ra, dec)[0]
+        cosines = self.vectors[candidates] @ center
+        inside = cosines >= math.cos(math.radians(radius))
+        indices, cosines = candidates[inside], cosines[inside]
+        separations = np.degrees(np.arccos(np.clip(cosines, -1.0, 1.0)))
+        order = np.argsort(separations, kind="stable")
+        return indices[order], separations[order]
+
+    def cone_search_many(self, ra, dec, radius) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        Vectorized cone search for many centers (radius may be scalar or per point).
+        Small batches use one dense matrix product over the whole catalog.
+        """
+        ra, dec = np.atleast_1d(ra), np.atleast_1d(dec)
+        radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), ra.shape)
+        if len(ra) * len(self) > DENSE_BATCH_LIMIT:
+            return [self.cone_search(*point) for point in zip(ra, dec, radius)]
+
+        cosines = radec_to_vectors(ra, dec) @ self.vectors.T
+        results = []
+        for row, limit in zip(cosines, np.cos(np.radians(radius))):
+            indices = np.flatnonzero(row >= limit)
+            separations = np.degrees(np.arccos(np.clip(row[indices], -1.0, 1.0)))
+            order = np.argsort(separations, kind="stable")
+            results.append((indices[order], separations[order]))
+        return results
+
+    def visible(
+        self, latitude, longitude, at: datetime, min_altitude: float = 0.0
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        Stars above `min_altitude` for one or many observers at time `at`.
+        The visible sky is a cone around the zenith (RA = local sidereal time,
+        Dec = latitude) with radius 90 - min_altitude.
+
+        Returns:
+            list: (star indices, altitudes in degrees) per observer, highest first.
+        """
+        latitude, longitude = np.broadcast_arrays(
+            np.atleast_1d(latitude), np.atleast_1d(longitude)
+        )
+        zenith_ra = local_sidereal_time(longitude, at)
+        return [
+            (indices, 90.0 - separations)
+            for indices, separations in self.cone_search_many(
+                zenith_ra, latitude, 90.0 - min_altitude
+            )
+        ]
+
+    def save(self, path: str = SKY_INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Written aside and renamed so a running API never loads a partial file
+        partial = f"{path}.partial.npz"
+        np.savez(
+            partial,
+            names=self.names.astype(str),
+            ra=self.ra,
+            dec=self.dec,
+            magnitudes=self.magnitudes,
+            bands=self.bands,
+        )
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str = SKY_INDEX_PATH) -> "SkyIndex":
+        with np.load(path) as data:
+            return cls(
+                data["names"],
+                data["ra"],
+                data["dec"],
+                data["magnitudes"],
+                bands=int(data["bands"]),
+            )
+
+
+async def build_sky_index() -> SkyIndex:
+    """Builds the index from stars with parsed coordinates in the catalog."""
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(Star.name, Star.ra, Star.dec, Star.magnitude).where(
+                Star.ra.is_not(None), Star.dec.is_not(None)
+            )
+        )
+        rows = result.all()
+
+    names = np.array([row.name for row in rows], dtype=object)
+    ra = np.array([row.ra for row in rows], dtype=np.float64)
+    dec = np.array([row.dec for row in rows], dtype=np.float64)
+    magnitudes = np.array(
+        [np.nan if row.magnitude is None else row.magnitude for row in rows],
+        dtype=np.float64,
+    )
+    return SkyIndex(names, ra, dec, magnitudes)
+
+
+class SkyIndexStore:
+    """
+    Holds the process-wide index. The update flow rebuilds the file in another
+    process, so the index is reloaded whenever the file changes. Stars stored
+    by the API are added in memory right away and picked up by the next
+    catalog rebuild (at most every REBUILD_INTERVAL seconds).
+    """
+
+    def __init__(self, path: str = SKY_INDEX_PATH):
+        self.path = path
+        self.index = None
+        self._mtime = None
+        self._built_at = None
+        # Stars added since the last rebuild, as (name, ra, dec, magnitude)
+        self._added = []
+
+    async def get(self) -> SkyIndex:
+        """The current index, reloaded if the file was replaced since it was read."""
+        if os.path.exists(self.path) and (
+            self.index is None or os.path.getmtime(self.path) != self._mtime
+        ):
+            self._load_file()
+        if self.index is None or (
+            (self._added or not len(self.index)) and self._rebuild_due()
+        ):
+            await self.rebuild()
+        return self.index
+
+    def add(self, name: str, ra: float, dec: float, magnitude: float | None = None):
+        """Makes a newly stored star searchable before the next rebuild."""
+        self._added.append((name, ra, dec, magnitude))
+        if self.index is not None:
+            self.index = self.index.with_stars([self._added[-1]])
+
+    def _rebuild_due(self) -> bool:
+        # Never built in this process (e.g. loaded from file): rebuild now
+        return (
+            self._built_at is None
+            or time.monotonic() - self._built_at >= REBUILD_INTERVAL
+        )
+
+    async def load(self):
+        """Loads the persisted index, falling back to a rebuild from the catalog."""
+        if os.path.exists(self.path):
+            self._load_file()
+        else:
+            await self.rebuild()
+
+    def _load_file(self):
+        mtime = os.path.getmtime(self.path)
+        self.index = SkyIndex.load(self.path).with_stars(self._added)
+        self._mtime = mtime
+        logger.info("Loaded sky index with %d stars", len(self.index))
+
+    async def rebuild(self):
+        """Rebuilds the index from the catalog and persists it unless it is empty."""
+        pending = len(self._added)
+        index = await build_sky_index()
+        # Stars added while the catalog was read may be missing from it
+        self._added = self._added[pending:]
+        self.index = index.with_stars(self._added)
+        self._built_at = time.monotonic()
+        if not len(self.index):
+            # An empty file would be reused as-is by every later start
+            logger.info("Catalog has no positioned stars; sky index not saved")
+            return
+        self.index.save(self.path)
+        self._mtime = os.path.getmtime(self.path)
+        logger.info("Rebuilt sky index with %d stars", len(self.index))
+
+
+# Singleton instance
+sky_index_store = SkyIndexStore()
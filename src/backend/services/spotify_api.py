@@ -0,0 +1,156 @@
+import asyncio
+import base64
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from src.backend.core.metrics import track_upstream
+from src.backend.core.services import services
+from src.backend.core.tracing import span
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Spotify Web API (both URLs can point at a local stand-in for benchmarks)
+SPOTIFY_API_URL = os.getenv("SPOTIFY_API_URL", "https://api.spotify.com/v1")
+SPOTIFY_TOKEN_URL = os.getenv(
+    "SPOTIFY_TOKEN_URL", "https://accounts.spotify.com/api/token"
+)
+SPOTIFY_CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID", "")
+SPOTIFY_CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET", "")
+
+# Playlists whose tracks make up the music index
+SPOTIFY_PLAYLIST_IDS = [
+    playlist_id.strip()
+    for playlist_id in os.getenv("SPOTIFY_PLAYLIST_IDS", "").split(",")
+    if playlist_id.strip()
+]
+
+# Maximum ids per /audio-features request
+AUDIO_FEATURES_BATCH = 100
+FETCH_CONCURRENCY = 4
+
+
+async def get_access_token(session: "aiohttp.ClientSession") -> str:
+    """Requests an app token with the client credentials flow."""
+    credentials = base64.b64encode(
+        f"{SPOTIFY_CLIENT_ID}:{SPOTIFY_CLIENT_SECRET}".encode()
+    ).decode()
+    with span("spotify.token"), track_upstream("spotify", "token") as call:
+        async with session.post(
+            SPOTIFY_TOKEN_URL,
+            data={"grant_type": "client_credentials"},
+            headers={"Authorization": f"Basic {credentials}"},
+        ) as response:
+            if response.status != 200:
+                call.fail()
+            response.raise_for_status()
+            return (await response.json())["access_token"]
+
+
+async def _get(session: "aiohttp.ClientSession", token: str, url: str, operation: str):
+    with span(f"spotify.{operation}"), track_upstream("spotify", operation) as call:
+        async with session.get(
+            url, headers={"Authorization": f"Bearer {token}"}
+        ) as response:
+            if response.status != 200:
+                call.fail()
+            response.raise_for_status()
+            return await response.json()
+
+
+async def fetch_playlist_tracks(
+    session: "aiohttp.ClientSession", token: str, playlist_id: str
+) -> list[dict]:
+    """
+    Lists a playlist's tracks, following pagination.
+
+    Returns:
+        list: Dicts with `id`, `name` and `artists` (comma-separated).
+    """
+    tracks = []
+    url = f"{SPOTIFY_API_URL}/playlists/{playlist_id}/tracks?limit=100"
+    while url:
+        page = await _get(session, token, url, "playlist_tracks")
+        for item in page.get("items", []):
+            track = item.get("track")
+            # Local files and removed tracks have no id
+            if track and track.get("id"):
+                tracks.append(
+                    {
+                        "id": track["id"],
+                        "name": track.get("name", ""),
+                        "artists": ", ".join(
+                            artist["name"] for artist in track.get("artists", [])
+                        ),
+                    }
+                )
+        url = page.get("next")
+    return tracks
+
+
+async def fetch_audio_features(
+    session: "aiohttp.ClientSession", token: str, track_ids: list[str]
+) -> dict[str, dict]:
+    """
+    Fetches audio features in batches of AUDIO_FEATURES_BATCH ids.
+
+    Returns:
+        dict: Audio features by track id (tracks without features are left out).
+    """
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def fetch_batch(batch: list[str]) -> list:
+        async with semaphore:
+            page = await _get(
+                session,
+                token,
+                f"{SPOTIFY_API_URL}/audio-features?ids={','.join(batch)}",
+                "audio_features",
+            )
+            return page.get("audio_features", [])
+
+    batches = [
+        track_ids[i : i + AUDIO_FEATURES_BATCH]
+        for i in range(0, len(track_ids), AUDIO_FEATURES_BATCH)
+    ]
+    pages = await asyncio.gather(*(fetch_batch(batch) for batch in batches))
+    return {features["id"]: features for page in pages for features in page if features}
+
+
+async def fetch_tracks_with_features(
+    playlist_ids: list[str] = SPOTIFY_PLAYLIST_IDS,
+) -> list[dict]:
+    """
+    Collects the tracks of the given playlists with their audio features.
+
+    Returns:
+        list: Unique tracks with `id`, `name`, `artists`, `valence`, `energy`,
+        `tempo` and `acousticness`.
+    """
+    session = services.http()
+    token = await get_access_token(session)
+    playlists = await asyncio.gather(
+        *(fetch_playlist_tracks(session, token, pid) for pid in playlist_ids)
+    )
+    tracks = {track["id"]: track for playlist in playlists for track in playlist}
+    features = await fetch_audio_features(session, token, list(tracks))
+
+    result = []
+    for track_id, track in tracks.items():
+        track_features = features.get(track_id)
+        if track_features is None:
+            continue
+        result.append(
+            {
+                **track,
+                "valence": track_features["valence"],
+                "energy": track_features["energy"],
+                "tempo": track_features["tempo"],
+                "acousticness": track_features["acousticness"],
+            }
+        )
+    logger.info("Fetched audio features for %d of %d tracks", len(result), len(tracks))
+    return result
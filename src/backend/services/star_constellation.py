@@ -1,8 +1,6 @@
-import openai
-import httpx
-from src.backend.config.settings import settings
-
-openai.api_key = settings.OPENAI_API_KEY
+from src.backend.core.metrics import track_upstream, record_openai_usage
+from src.backend.core.services import services
+from src.backend.core.tracing import span
 
 SIMBAD_API_URL = "https://simbad.u-strasbg.fr/simbad/sim-id?output.format=json&Ident="
 
@@ -11,12 +9,14 @@ async def get_constellation_from_simbad(star_name: str):
     """
     Fetches the constellation of a star from the SIMBAD astronomical database.
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(SIMBAD_API_URL + star_name)
-        if response.status_code == 200:
-            data = response.json()
-            if "MAIN_ID" in data and "constellation" in data:
-                return data["constellation"]
+    with span("simbad.sim-id"), track_upstream("simbad", "sim-id") as call:
+        async with services.http().get(SIMBAD_API_URL + star_name) as response:
+            if response.status != 200:
+                call.fail()
+                return None
+            data = await response.json(content_type=None)
+    if "MAIN_ID" in data and "constellation" in data:
+        return data["constellation"]
     return None
 
 
@@ -29,14 +29,19 @@ async def get_constellation_with_ai(star_name: str):
     Respond with only the name of the constellation.
     """
 
-    response = openai.ChatCompletion.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=20,
-        temperature=0.5,
-    )
-
-    return response["choices"][0]["message"]["content"].strip()
+    with (
+        span("openai.chat.completions", model="gpt-4"),
+        track_upstream("openai", "chat.completions"),
+    ):
+        response = await services.openai().chat.completions.create(
+            model="gpt-4",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=20,
+            temperature=0.5,
+        )
+    record_openai_usage("gpt-4", response.usage)
+
+    return response.choices[0].message.content.strip()
 
 
 async def get_star_constellation(star_name: str):
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import logging
+import math
+
+import numpy as np
+from sqlalchemy import select
+
+from src.backend.core.database import async_session_maker
+from src.backend.core.tracing import span
+from src.backend.models.emotions import Emotion
+from src.backend.models.star import Star
+from src.backend.services import hot_keys
+from src.backend.services.music_index import FEATURES, MusicIndex
+from src.backend.services.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Recommendations cached per star; requests slice this list
+CACHED_TRACKS = 20
+
+# Share of the target vector taken from the emotion profile when one is known
+EMOTION_WEIGHT = 0.5
+
+# Star color -> (valence, acousticness): hot blue stars feel bright and
+# electric, cool red ones warm and intimate
+COLOR_MOODS = {
+    "Blue": (0.75, 0.15),
+    "Blue-white": (0.7, 0.25),
+    "White": (0.65, 0.35),
+    "Yellow-white": (0.6, 0.45),
+    "Yellow": (0.55, 0.55),
+    "Orange": (0.45, 0.65),
+    "Red": (0.3, 0.75),
+}
+
+# Luminosity class -> energy: giants are grander than dwarfs
+LUMINOSITY_ENERGY = {
+    "Hypergiant": 0.95,
+    "Bright supergiant": 0.9,
+    "Supergiant": 0.85,
+    "Bright giant": 0.75,
+    "Giant": 0.65,
+    "Subgiant": 0.55,
+    "Main sequence": 0.45,
+    "Subdwarf": 0.35,
+    "White dwarf": 0.25,
+}
+
+# Temperature range (K) mapped log-linearly onto [0, 1] "heat"
+TEMPERATURE_RANGE = (2500, 50000)
+
+# Emotion -> (valence, energy, tempo, acousticness), normalized like the index
+EMOTION_FEATURES = {
+    "joy": (0.9, 0.8, 0.7, 0.2),
+    "happiness": (0.85, 0.7, 0.65, 0.3),
+    "excitement": (0.8, 0.9, 0.8, 0.15),
+    "love": (0.75, 0.45, 0.4, 0.6),
+    "hope": (0.7, 0.55, 0.5, 0.5),
+    "inspiration": (0.7, 0.65, 0.55, 0.4),
+    "peace": (0.6, 0.2, 0.3, 0.85),
+    "calm": (0.55, 0.2, 0.3, 0.8),
+    "nostalgia": (0.4, 0.35, 0.35, 0.7),
+    "melancholy": (0.25, 0.3, 0.35, 0.7),
+    "loneliness": (0.2, 0.25, 0.3, 0.8),
+    "sadness": (0.15, 0.25, 0.3, 0.75),
+    "anxiety": (0.25, 0.7, 0.7, 0.3),
+    "fear": (0.2, 0.6, 0.6, 0.3),
+    "anger": (0.2, 0.9, 0.8, 0.1),
+}
+
+
+def star_vector(star_data: dict) -> np.ndarray:
+    """
+    Maps a star's temperature, color and luminosity class onto the audio
+    feature space (see FEATURES): hotter stars get faster, more energetic music.
+    """
+    temperature = star_data.get("estimated_temperature")
+    if temperature:
+        low, high = TEMPERATURE_RANGE
+        heat = (math.log10(temperature) - math.log10(low)) / (
+            math.log10(high) - math.log10(low)
+        )
+        heat = min(max(heat, 0.0), 1.0)
+    else:
+        heat = 0.5
+
+    valence, acousticness = COLOR_MOODS.get(star_data.get("color"), (0.5, 0.5))
+    energy = (LUMINOSITY_ENERGY.get(star_data.get("luminosity_class"), 0.5) + heat) / 2
+    values = {
+        "valence": valence,
+        "energy": energy,
+        "tempo": heat,
+        "acousticness": acousticness,
+    }
+    return np.array([values[name] for name in FEATURES], dtype=np.float32)
+
+
+def emotion_vector(emotions) -> np.ndarray | None:
+    """Mean feature vector of the known emotions, or None if none are known."""
+    known = [
+        EMOTION_FEATURES[name.lower()]
+        for name in emotions
+        if name.lower() in EMOTION_FEATURES
+    ]
+    if not known:
+        return None
+    return np.mean(np.array(known, dtype=np.float32), axis=0)
+
+
+def target_vector(star_data: dict, emotions=()) -> np.ndarray:
+    """Blends the star's vector with its emotion profile (EMOTION_WEIGHT)."""
+    vector = star_vector(star_data)
+    mood = emotion_vector(emotions)
+    if mood is None:
+        return vector
+    return (1 - EMOTION_WEIGHT) * vector + EMOTION_WEIGHT * mood
+
+
+def music_cache_key(index: MusicIndex, star_name: str, emotions=()) -> str:
+    # The index version changes on re-ingestion, retiring stale recommendations
+    mood = "+".join(sorted({name.lower() for name in emotions}))
+    return f"music:{index.version}:{star_name}:{mood}"
+
+
+async def load_star_emotions(db_names: list[str]) -> dict[str, list[str]]:
+    """Emotion names linked to each star in the catalog."""
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(Star.name, Emotion.name)
+            .join(Star.emotions)
+            .where(Star.name.in_(db_names))
+        )
+        rows = result.all()
+
+    emotions = {}
+    for star_name, emotion_name in rows:
+        emotions.setdefault(star_name, []).append(emotion_name)
+    return emotions
+
+
+async def recommend_tracks(
+    index: MusicIndex,
+    stars: dict[str, dict],
+    mood=(),
+    limit: int = CACHED_TRACKS,
+) -> dict[str, list[dict]]:
+    """
+    Recommends tracks for many stars at once.
+
+    Cached stars are served from Redis in one MGET; the rest are matched in a
+    single batched nearest-neighbour query and cached per star.
+
+    Args:
+        index: Music index to match against.
+        stars: SIMBAD star data by requested star name.
+        mood: The user's emotions, blended with each star's stored emotions.
+        limit: Tracks returned per star (at most CACHED_TRACKS).
+
+    Returns:
+        dict: Track lists by requested star name, closest match first.
+    """
+    names = list(stars)
+    keys = [music_cache_key(index, name, mood) for name in names]
+    cached = await redis_client.mget(keys)
+
+    results = {}
+    missing = []
+    for name, value in zip(names, cached):
+        if value:
+            results[name] = json.loads(value)
+        else:
+            missing.append(name)
+
+    if missing:
+        stored = await load_star_emotions(
+            [stars[name].get("name", name) for name in missing]
+        )
+        targets = np.stack(
+            [
+                target_vector(
+                    stars[name],
+                    [*mood, *stored.get(stars[name].get("name", name), [])],
+                )
+                for name in missing
+            ]
+        )
+        with span("music.nearest", stars=len(missing)):
+            indices, distances = index.nearest(targets, CACHED_TRACKS)
+
+        expires = await asyncio.gather(
+            *(hot_keys.ttl_for("music", name) for name in missing)
+        )
+        pipe = redis_client.pipeline()
+        for name, row, row_distances, expire in zip(
+            missing, indices, distances, expires
+        ):
+            tracks = [
+                {**index.track(i), "distance": round(float(distance), 4)}
+                for i, distance in zip(row, row_distances)
+            ]
+            results[name] = tracks
+            if pipe is not None:
+                pipe.set(
+                    music_cache_key(index, name, mood), json.dumps(tracks), ex=expire
+                )
+        if pipe is not None:
+            await redis_client.execute(pipe)
+        logger.debug("Matched music for %d stars", len(missing))
+
+    return {name: results[name][:limit] for name in names}
@@ -0,0 +1,122 @@
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks.fakes import FakeRedis
+from src.backend.routes import api
+from src.backend.services import cache_warming, hot_keys
+from src.backend.services.redis_client import redis_client
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(redis_client, "redis", redis)
+    return redis
+
+
+class RacingRedis(FakeRedis):
+    """Runs `race` right before the first transaction, i.e. mid-decay()."""
+
+    def __init__(self, race):
+        super().__init__()
+        self.race = race
+
+    def pipeline(self, transaction: bool = True):
+        pipe = super().pipeline(transaction)
+        if transaction and self.race:
+            race, self.race = self.race, None
+            execute = pipe.execute
+
+            async def racing_execute():
+                await race(self)
+                return await execute()
+
+            pipe.execute = racing_execute
+        return pipe
+
+
+def test_sketch_fields_are_stable_and_in_range():
+    fields = hot_keys.sketch_fields("Antares")
+
+    assert fields == hot_keys.sketch_fields("Antares")
+    assert [field.split(":")[0] for field in fields] == [
+        str(row) for row in range(hot_keys.SKETCH_DEPTH)
+    ]
+    assert all(0 <= int(f.split(":")[1]) < hot_keys.SKETCH_WIDTH for f in fields)
+
+
+def test_top_k_ranks_by_estimated_count(fake_redis, monkeypatch):
+    monkeypatch.setattr(hot_keys, "TOP_K", 2)
+    counts = {"Antares": 5, "Sirius": 3, "Vega": 1}
+
+    async def scenario():
+        for name, count in counts.items():
+            for _ in range(count):
+                await hot_keys.record_access(name)
+        return await hot_keys.hottest(10)
+
+    hottest = asyncio.run(scenario())
+
+    # Count-min estimates never undercount; Vega falls out of the top 2
+    assert [name for name, _ in hottest] == ["Antares", "Sirius"]
+    assert all(score >= counts[name] for name, score in hottest)
+
+
+def test_decay_halves_counters_and_keeps_concurrent_increments(monkeypatch):
+    async def live_traffic(redis):
+        for field in hot_keys.sketch_fields("Antares"):
+            await redis.hincrby(hot_keys.SKETCH_KEY, field, 1)
+        await redis.zincrby(hot_keys.TOP_KEY, 1, "Antares")
+
+    redis = RacingRedis(live_traffic)
+    monkeypatch.setattr(redis_client, "redis", redis)
+
+    async def scenario():
+        for _ in range(8):
+            await hot_keys.record_access("Antares")
+        await hot_keys.record_access("Vega")
+        await hot_keys.decay()
+        return await hot_keys.hottest(), await redis.hgetall(hot_keys.SKETCH_KEY)
+
+    hottest, counters = asyncio.run(scenario())
+
+    # 8 -> 4, plus the increment that landed between decay()'s read and write
+    assert hottest == [("Antares", 5.0)]
+    for field in hot_keys.sketch_fields("Antares"):
+        assert int(counters[field]) == 5
+
+
+def test_unknown_stars_are_not_tracked(fake_redis, monkeypatch):
+    tracked = []
+    monkeypatch.setattr(api, "track_access", tracked.append)
+
+    async def fetch_star_data(star_name, refresh=False):
+        return {"error": f"Star '{star_name}' not found in SIMBAD."}
+
+    monkeypatch.setattr(api, "fetch_star_data", fetch_star_data)
+
+    async def scenario():
+        from src.backend.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await c.get("/stars/Nonexistent/mythology")
+
+    assert asyncio.run(scenario()).status_code == 404
+    assert tracked == []
+
+
+def test_warming_drops_names_simbad_does_not_know(fake_redis, monkeypatch):
+    async def fetch_star_data(star_name, refresh=False):
+        return {"error": f"Star '{star_name}' not found in SIMBAD."}
+
+    monkeypatch.setattr(cache_warming, "fetch_star_data", fetch_star_data)
+
+    async def scenario():
+        await hot_keys.record_access("Nonexistent")
+        refreshed = await cache_warming.warm_hot_keys()
+        return refreshed, await hot_keys.hottest()
+
+    assert asyncio.run(scenario()) == (0, [])
@@ -0,0 +1,70 @@
+import json
+import logging
+import queue
+
+from src.backend.core import database
+from src.backend.core.logging import (
+    DEFAULT_SAMPLING,
+    SAMPLED_UP_TO,
+    TEXT_FORMAT,
+    JsonFormatter,
+    SamplingFilter,
+    StructuredQueueHandler,
+    _parse_sampling,
+)
+
+
+def _record(level: int) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 0, "message", (), None)
+
+
+def test_sampling_keeps_one_in_n_below_warning():
+    sampler = SamplingFilter(10)
+
+    kept = [sampler.filter(_record(logging.INFO)) for _ in range(100)]
+
+    assert sum(kept) == 10
+    assert all(sampler.filter(_record(logging.WARNING)) for _ in range(5))
+
+
+def test_slow_query_warnings_are_kept_unless_sampling_is_configured():
+    name = database.slow_query_logger.name
+    assert name not in DEFAULT_SAMPLING
+
+    every = _parse_sampling(f"{name}=10")[name]
+    sampler = SamplingFilter(every, SAMPLED_UP_TO[name])
+    kept = [sampler.filter(_record(logging.WARNING)) for _ in range(100)]
+
+    assert sum(kept) == 10
+    assert all(sampler.filter(_record(logging.ERROR)) for _ in range(5))
+
+
+def _queued_exception() -> logging.LogRecord:
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("test.queued_exception")
+    handler = StructuredQueueHandler(log_queue)
+    logger.addHandler(handler)
+    try:
+        try:
+            raise ValueError("bad star")
+        except ValueError:
+            logger.exception("Failed for %s", "Vega", extra={"star": "Vega"})
+    finally:
+        logger.removeHandler(handler)
+    return log_queue.get_nowait()
+
+
+def test_queued_tracebacks_stay_a_structured_field():
+    payload = json.loads(JsonFormatter().format(_queued_exception()))
+
+    assert payload["message"] == "Failed for Vega"
+    assert payload["star"] == "Vega"
+    assert payload["exc_info"].startswith("Traceback (most recent call last)")
+    assert payload["exc_info"].endswith("ValueError: bad star")
+
+
+def test_queued_tracebacks_are_appended_in_text_format():
+    line = logging.Formatter(TEXT_FORMAT).format(_queued_exception())
+
+    assert " - Failed for Vega\nTraceback (most recent call last)" in line
+    assert line.endswith("ValueError: bad star")
@@ -0,0 +1,159 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from benchmarks.fakes import FakeRedis
+from src.backend import main
+from src.backend.core.metrics import (
+    FLOW_DURATION,
+    FLOW_ITEMS,
+    HTTP_REQUEST_DURATION,
+    UPSTREAM_DURATION,
+    UPSTREAM_ERRORS,
+    MetricsRegistry,
+    track_upstream,
+    upstream_metrics,
+)
+from src.backend.services import flow_metrics
+from src.backend.services.redis_client import redis_client
+
+
+def test_counter_help_and_type_use_the_sample_name():
+    registry = MetricsRegistry()
+    registry.counter("antares_things", "Things.", ("kind",)).labels("a").inc(2)
+
+    assert registry.render().splitlines() == [
+        "# HELP antares_things_total Things.",
+        "# TYPE antares_things_total counter",
+        'antares_things_total{kind="a"} 2',
+    ]
+
+
+def test_histogram_samples_round_trip():
+    registry = MetricsRegistry()
+    source = registry.histogram("antares_source_seconds", "Source.", buckets=(1.0,))
+    target = registry.histogram("antares_target_seconds", "Target.", buckets=(1.0,))
+    source.observe(0.5)
+    source.observe(3.0)
+
+    for values, samples in source.samples().items():
+        target.set_samples(values, samples)
+
+    assert target.labels().counts == [1, 1]
+    assert target.labels().sum == 3.5
+
+
+def test_flow_metrics_published_by_a_worker_reach_the_api(monkeypatch):
+    monkeypatch.setattr(redis_client, "redis", FakeRedis())
+    monkeypatch.setattr(flow_metrics, "_published", {})
+    items = FLOW_ITEMS.labels("test_flow", "updated")
+    duration = FLOW_DURATION.labels("test_flow")
+
+    async def scenario():
+        # Worker: two pushes only add what changed since the previous one
+        items.inc(3)
+        duration.observe(2.0)
+        await flow_metrics.publish_flow_metrics()
+        items.inc(1)
+        await flow_metrics.publish_flow_metrics()
+
+        # API: its own (empty) children are overwritten with the published totals
+        items.value = 0
+        duration.counts = [0] * len(duration.counts)
+        await flow_metrics.load_flow_metrics()
+
+    asyncio.run(scenario())
+
+    assert items.value == 4
+    assert sum(duration.counts) == 1
+    assert duration.sum == 2.0
+
+
+def test_upstream_metrics_are_bound_once_and_count_failures():
+    assert upstream_metrics("test", "op") is upstream_metrics("test", "op")
+    duration = UPSTREAM_DURATION.labels("test", "op")
+    errors = UPSTREAM_ERRORS.labels("test", "op")
+    calls, failures = sum(duration.counts), errors.value
+
+    with track_upstream("test", "op") as call:
+        call.fail()
+    with pytest.raises(RuntimeError), track_upstream("test", "op"):
+        raise RuntimeError("upstream down")
+
+    assert sum(duration.counts) == calls + 2
+    assert errors.value == failures + 2
+
+
+def test_redis_client_times_calls_inline(monkeypatch):
+    from src.backend.services.redis_client import redis_client
+
+    class BrokenRedis(FakeRedis):
+        async def get(self, key):
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr(redis_client, "redis", BrokenRedis())
+    duration = UPSTREAM_DURATION.labels("redis", "get")
+    errors = UPSTREAM_ERRORS.labels("redis", "get")
+    calls, failures = sum(duration.counts), errors.value
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(redis_client.get("star:Vega"))
+
+    assert sum(duration.counts) == calls + 1
+    assert errors.value == failures + 1
+
+
+def test_metrics_endpoint_survives_a_redis_failure(monkeypatch):
+    from src.backend.routes import metrics
+
+    class BrokenRedis(FakeRedis):
+        def pipeline(self, transaction: bool = True):
+            pipe = super().pipeline(transaction)
+
+            async def execute():
+                raise ConnectionError("redis down")
+
+            pipe.execute = execute
+            return pipe
+
+    monkeypatch.setattr(redis_client, "redis", BrokenRedis())
+
+    async def scenario():
+        app = FastAPI()
+        app.include_router(metrics.router)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await c.get("/metrics")
+
+    response = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    assert "antares_http_request_duration_seconds" in response.text
+
+
+def test_request_latency_covers_the_streamed_body():
+    delay = 0.2
+    app = FastAPI()
+    app.middleware("http")(main.record_request_latency)
+
+    @app.get("/latency-stream")
+    async def stream():
+        async def chunks():
+            yield b"first,"
+            await asyncio.sleep(delay)
+            yield b"last"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await c.get("/latency-stream")
+
+    assert asyncio.run(scenario()).text == "first,last"
+    child = HTTP_REQUEST_DURATION.labels("GET", "/latency-stream", "200")
+    assert sum(child.counts) == 1
+    assert child.sum >= delay
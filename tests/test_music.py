@@ -0,0 +1,218 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+from benchmarks.fakes import FakeRedis, StubServer, spotify_stub, synthetic_tracks
+from src.backend.core.services import services
+from src.backend.routes import music
+from src.backend.services import spotify_api, star_music
+from src.backend.services.music_index import (
+    FEATURES,
+    MusicIndex,
+    MusicIndexStore,
+    normalize_features,
+)
+from src.backend.services.redis_client import redis_client
+from src.backend.services.star_music import (
+    EMOTION_FEATURES,
+    EMOTION_WEIGHT,
+    recommend_tracks,
+    star_vector,
+    target_vector,
+)
+
+ANTARES = {
+    "name": "alf Sco",
+    "estimated_temperature": 3500,
+    "color": "Red",
+    "luminosity_class": "Supergiant",
+}
+SPICA = {
+    "name": "alf Vir",
+    "estimated_temperature": 22000,
+    "color": "Blue",
+    "luminosity_class": "Main sequence",
+}
+
+
+def _index(count: int, seed: int = 0) -> MusicIndex:
+    # Shaped like fetch_tracks_with_features() output: artists joined into a string
+    tracks = synthetic_tracks(count, seed)
+    return MusicIndex.from_tracks(
+        [
+            {**track, "artists": ", ".join(a["name"] for a in track["artists"])}
+            for track in tracks
+        ]
+    )
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(redis_client, "redis", redis)
+    return redis
+
+
+def test_ingestion_follows_pages_and_batches(monkeypatch):
+    tracks = synthetic_tracks(250)
+
+    async def scenario():
+        server = StubServer(spotify_stub(tracks, playlists=3, page_size=40))
+        url = await server.start()
+        monkeypatch.setattr(spotify_api, "SPOTIFY_API_URL", f"{url}/v1")
+        monkeypatch.setattr(spotify_api, "SPOTIFY_TOKEN_URL", f"{url}/api/token")
+        try:
+            return await spotify_api.fetch_tracks_with_features(
+                ["playlist0", "playlist1", "playlist2"]
+            )
+        finally:
+            await services.aclose()
+            await server.stop()
+
+    index = MusicIndex.from_tracks(asyncio.run(scenario()))
+
+    assert len(index) == len(tracks)
+    by_id = {track["id"]: track for track in tracks}
+    for i in (0, 99, 100, 249):
+        track = index.track(i)
+        expected = by_id[track["id"]]
+        assert track["artists"] == expected["artists"][0]["name"]
+        for name in FEATURES:
+            assert track[name] == pytest.approx(expected[name], abs=1e-3)
+
+
+@pytest.mark.parametrize("count, k", [(300, 5), (5000, 20)])
+def test_nearest_matches_brute_force(count, k):
+    # 5000 tracks with k=20 goes through the sampled bound in _top_k
+    index = _index(count, seed=1)
+    targets = np.random.default_rng(2).random((30, len(FEATURES)), dtype=np.float32)
+
+    indices, distances = index.nearest(targets, k)
+
+    expected = np.linalg.norm(index.vectors[None, :, :] - targets[:, None, :], axis=2)
+    for row, target_distances in enumerate(expected):
+        assert distances[row] == pytest.approx(np.sort(target_distances)[:k], abs=1e-4)
+        assert target_distances[indices[row]] == pytest.approx(distances[row], abs=1e-4)
+    assert index.nearest(targets[0], len(index) + 10)[0].shape == (1, len(index))
+
+
+def test_star_vector_follows_temperature_color_and_luminosity():
+    hot, cool = star_vector(SPICA), star_vector(ANTARES)
+    valence, tempo = FEATURES.index("valence"), FEATURES.index("tempo")
+    acousticness = FEATURES.index("acousticness")
+
+    assert hot[tempo] > cool[tempo]
+    assert hot[valence] > cool[valence]
+    assert hot[acousticness] < cool[acousticness]
+    assert star_vector({})[tempo] == pytest.approx(0.5)
+    assert np.all((hot >= 0) & (hot <= 1)) and np.all((cool >= 0) & (cool <= 1))
+
+
+def test_target_vector_blends_known_emotions():
+    star = star_vector(ANTARES)
+    calm = np.array(EMOTION_FEATURES["calm"], dtype=np.float32)
+    joy = np.array(EMOTION_FEATURES["joy"], dtype=np.float32)
+
+    assert np.allclose(target_vector(ANTARES), star)
+    assert np.allclose(target_vector(ANTARES, ["unknown"]), star)
+    assert np.allclose(
+        target_vector(ANTARES, ["Calm", "unknown"]),
+        (1 - EMOTION_WEIGHT) * star + EMOTION_WEIGHT * calm,
+    )
+    assert np.allclose(
+        target_vector(ANTARES, ["calm", "joy"]),
+        (1 - EMOTION_WEIGHT) * star + EMOTION_WEIGHT * (calm + joy) / 2,
+    )
+
+
+def test_recommendations_are_cached_per_star(fake_redis, monkeypatch):
+    index = _index(500)
+    nearest = index.nearest
+    queried = []
+
+    def counting_nearest(targets, k):
+        queried.append(len(targets))
+        return nearest(targets, k)
+
+    async def load_star_emotions(db_names):
+        return {}
+
+    monkeypatch.setattr(index, "nearest", counting_nearest)
+    monkeypatch.setattr(star_music, "load_star_emotions", load_star_emotions)
+
+    async def scenario():
+        first = await recommend_tracks(index, {"Antares": ANTARES}, ["calm"], 5)
+        # Antares comes from the cache; only Spica is matched
+        both = await recommend_tracks(
+            index, {"Antares": ANTARES, "Spica": SPICA}, ["calm"], 5
+        )
+        again = await recommend_tracks(
+            index, {"Antares": ANTARES, "Spica": SPICA}, ["calm"], 3
+        )
+        return first, both, again
+
+    first, both, again = asyncio.run(scenario())
+
+    assert queried == [1, 1]
+    assert both["Antares"] == first["Antares"]
+    assert again["Antares"] == first["Antares"][:3]
+    assert again["Spica"] == both["Spica"][:3]
+    target = normalize_features(np.array([[first["Antares"][0][n] for n in FEATURES]]))
+    assert np.linalg.norm(target - target_vector(ANTARES, ["calm"])) == pytest.approx(
+        first["Antares"][0]["distance"], abs=1e-2
+    )
+
+
+def _get_star_music(params) -> httpx.Response:
+    async def request():
+        from src.backend.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await c.get("/star_music/", params=params)
+
+    return asyncio.run(request())
+
+
+@pytest.fixture
+def built_index(tmp_path, monkeypatch):
+    store = MusicIndexStore(str(tmp_path / "music_index.npz"))
+    store.replace(_index(100))
+    monkeypatch.setattr(music, "music_index_store", store)
+    return store
+
+
+def test_star_music_rejects_unknown_emotions_and_too_many_stars(built_index):
+    response = _get_star_music({"star_name": "Antares", "emotion": ["calm", "ennui"]})
+    assert response.status_code == 422
+    assert "ennui" in response.json()["detail"]
+
+    names = [f"star{i}" for i in range(music.MAX_STARS + 1)]
+    assert _get_star_music({"star_name": names}).status_code == 422
+
+
+def test_star_music_is_unavailable_without_an_index(tmp_path, monkeypatch):
+    store = MusicIndexStore(str(tmp_path / "missing.npz"))
+    monkeypatch.setattr(music, "music_index_store", store)
+
+    assert _get_star_music({"star_name": "Antares"}).status_code == 503
+
+
+def test_star_music_reports_missing_stars(built_index, fake_redis, monkeypatch):
+    tracked = []
+
+    async def fetch_star_data(star_name, refresh=False):
+        if star_name == "Antares":
+            return ANTARES
+        return {"error": f"Star '{star_name}' not found in SIMBAD."}
+
+    monkeypatch.setattr(music, "fetch_star_data", fetch_star_data)
+    monkeypatch.setattr(music, "track_access", tracked.append)
+
+    response = _get_star_music({"star_name": ["Antares", "Nope"]})
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Stars not found: Nope"
+    assert tracked == []
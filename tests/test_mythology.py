@@ -0,0 +1,264 @@
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from benchmarks.fakes import FakeRedis
+from src.backend.core.services import services
+from src.backend.migrations import m0001_star_positions_and_mythology as migration
+from src.backend.models.star import Base, Star
+from src.backend.routes import api
+from src.backend.services import ai_star_info
+from src.backend.services.ai_star_info import (
+    MYTHOLOGY_PROMPT_HASH,
+    MYTHOLOGY_SECTIONS,
+    cache_mythology,
+    get_cached_mythology,
+    get_mythology,
+    load_mythology_sections,
+    mythology_cache_key,
+    save_mythology,
+)
+from src.backend.services.redis_client import redis_client
+
+# filtered_stars as created before ra/dec and the mythology document
+LEGACY_TABLE = """
+CREATE TABLE filtered_stars (
+    id INTEGER PRIMARY KEY,
+    name VARCHAR UNIQUE,
+    spectral_type VARCHAR,
+    magnitude FLOAT,
+    color VARCHAR,
+    temperature INTEGER,
+    distance FLOAT,
+    coordinates VARCHAR,
+    mythology VARCHAR,
+    last_mythology_update DATETIME
+)
+"""
+
+
+def test_analyze_returns_simbad_errors_without_generating(monkeypatch):
+    async def fail(*args, **kwargs):
+        raise AssertionError("mythology requested for a SIMBAD error")
+
+    monkeypatch.setattr(ai_star_info, "get_mythology", fail)
+    error = {"error": "Star not found in SIMBAD"}
+
+    assert asyncio.run(ai_star_info.analyze_star_mythology("Nope", error)) == error
+
+
+def test_migration_upgrades_legacy_table(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stars.db'}")
+        async with engine.begin() as conn:
+            await conn.execute(text(LEGACY_TABLE))
+            await conn.execute(
+                text(
+                    "INSERT INTO filtered_stars (id, name, coordinates, mythology) "
+                    "VALUES (1, 'alf Sco', '16 29 24.460 -26 25 55.21', 'Heart of the scorpion'), "
+                    "(2, 'bet Ori', NULL, ''), (3, 'alf Lyr', 'unparsable', NULL)"
+                )
+            )
+
+        # Running twice must not fail or wrap the documents again
+        await migration.upgrade(engine)
+        await migration.upgrade(engine)
+
+        async with async_sessionmaker(engine)() as session:
+            stars = {star.name: star for star in (await session.scalars(select(Star)))}
+        await engine.dispose()
+        return stars
+
+    stars = asyncio.run(scenario())
+
+    assert stars["alf Sco"].mythology == {
+        "version": 0,
+        "legacy_text": "Heart of the scorpion",
+    }
+    assert round(stars["alf Sco"].ra, 4) == 247.3519
+    assert round(stars["alf Sco"].dec, 4) == -26.432
+    assert stars["bet Ori"].mythology is None and stars["bet Ori"].ra is None
+    assert stars["alf Lyr"].mythology is None and stars["alf Lyr"].ra is None
+
+
+def _document(prompt_hash: str = MYTHOLOGY_PROMPT_HASH, text: str = "current") -> dict:
+    return {
+        "version": ai_star_info.MYTHOLOGY_VERSION,
+        "sections": {name: f"{text} {name}" for name in MYTHOLOGY_SECTIONS},
+        "model": ai_star_info.MYTHOLOGY_MODEL,
+        "prompt_hash": prompt_hash,
+        "generated_at": "2026-01-01T00:00:00+00:00",
+    }
+
+
+class RecordingRedis(FakeRedis):
+    """Records which hash reads were issued."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+
+    async def hmget(self, key, fields):
+        self.reads.append(("hmget", key, list(fields)))
+        return await super().hmget(key, fields)
+
+    async def hgetall(self, key):
+        self.reads.append(("hgetall", key))
+        return await super().hgetall(key)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = RecordingRedis()
+    monkeypatch.setattr(redis_client, "redis", redis)
+    return redis
+
+
+def _with_catalog(tmp_path, monkeypatch, scenario, statements=None):
+    """Runs `scenario()` against a SQLite catalog holding alf Lyr (Vega)."""
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stars.db'}")
+        monkeypatch.setattr(services, "_engine", engine)
+        monkeypatch.setattr(services, "_session_factory", None)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with services.session_factory()() as session:
+            session.add(Star(name="alf Lyr"))
+            await session.commit()
+        if statements is not None:
+            event.listen(
+                engine.sync_engine,
+                "before_cursor_execute",
+                lambda conn, cursor, statement, parameters, *args: statements.append(
+                    (statement, parameters)
+                ),
+            )
+        try:
+            return await scenario()
+        finally:
+            await services.aclose()
+
+    return asyncio.run(run())
+
+
+def test_cached_sections_are_read_with_hmget(fake_redis):
+    async def scenario():
+        await cache_mythology("Vega", _document())
+        one = await get_cached_mythology("Vega", ["message_for_the_user"])
+        every = await get_cached_mythology("Vega")
+        return one, every
+
+    one, every = asyncio.run(scenario())
+
+    key = mythology_cache_key("Vega")
+    assert one == {"message_for_the_user": "current message_for_the_user"}
+    assert fake_redis.reads[0] == (
+        "hmget",
+        key,
+        ["_prompt_hash", "message_for_the_user"],
+    )
+    assert every == _document()["sections"]
+    assert fake_redis.reads[1] == ("hgetall", key)
+
+
+def test_cached_sections_with_another_prompt_hash_are_a_miss(fake_redis):
+    async def scenario():
+        await cache_mythology("Vega", _document(prompt_hash="old"))
+        return (
+            await get_cached_mythology("Vega", ["message_for_the_user"]),
+            await get_cached_mythology("Vega"),
+            await get_cached_mythology("Altair", ["message_for_the_user"]),
+        )
+
+    assert asyncio.run(scenario()) == (None, None, None)
+
+
+def test_catalog_reads_project_sections_by_json_path(tmp_path, monkeypatch):
+    statements = []
+
+    async def scenario():
+        await save_mythology("alf Lyr", _document())
+        statements.clear()
+        some = await load_mythology_sections(
+            "alf Lyr", ["mythological_meaning", "message_for_the_user"]
+        )
+        every = await load_mythology_sections("alf Lyr")
+        await save_mythology("alf Lyr", _document(prompt_hash="old"))
+        stale = await load_mythology_sections("alf Lyr", ["message_for_the_user"])
+        return some, every, stale
+
+    some, every, stale = _with_catalog(tmp_path, monkeypatch, scenario, statements)
+
+    assert some == {
+        "mythological_meaning": "current mythological_meaning",
+        "message_for_the_user": "current message_for_the_user",
+    }
+    assert every == _document()["sections"]
+    assert stale is None
+    # Only the requested paths are selected, not the whole document
+    statement, parameters = statements[0]
+    projection = statement.split("FROM")[0]
+    assert projection.count("JSON_EXTRACT(filtered_stars.mythology, ?)") == 2
+    assert projection.count("filtered_stars.mythology") == 2
+    paths = [value for value in parameters if str(value).startswith("$.")]
+    assert paths[:2] == [
+        '$."sections"."mythological_meaning"',
+        '$."sections"."message_for_the_user"',
+    ]
+
+
+@pytest.mark.parametrize("with_redis", [True, False])
+def test_stale_prompt_hash_regenerates(tmp_path, monkeypatch, with_redis):
+    generated = []
+
+    async def generate_mythology(star_name):
+        generated.append(star_name)
+        return _document(text="new")
+
+    monkeypatch.setattr(ai_star_info, "generate_mythology", generate_mythology)
+    monkeypatch.setattr(redis_client, "redis", FakeRedis() if with_redis else None)
+
+    async def scenario():
+        stale = _document(prompt_hash="old", text="old")
+        await save_mythology("alf Lyr", stale)
+        await cache_mythology("Vega", stale)
+        star_data = {"name": "alf Lyr"}
+        first = await get_mythology("Vega", star_data, ["message_for_the_user"])
+        second = await get_mythology("Vega", star_data, ["message_for_the_user"])
+        stored = await ai_star_info.load_mythology("alf Lyr")
+        return first, second, stored
+
+    first, second, stored = _with_catalog(tmp_path, monkeypatch, scenario)
+
+    assert first == second == {"message_for_the_user": "new message_for_the_user"}
+    assert generated == ["Vega"]
+    assert stored["prompt_hash"] == MYTHOLOGY_PROMPT_HASH
+
+
+@pytest.mark.parametrize(
+    "path", ["/star_info/?star_name=Vega", "/stars/Vega/mythology"]
+)
+def test_unknown_sections_are_rejected(monkeypatch, path):
+    async def fetch_star_data(star_name, refresh=False):
+        raise AssertionError("star looked up for an invalid request")
+
+    monkeypatch.setattr(api, "fetch_star_data", fetch_star_data)
+
+    async def scenario():
+        from src.backend.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            separator = "&" if "?" in path else "?"
+            return await c.get(
+                f"{path}{separator}sections=message_for_the_user,horoscope"
+            )
+
+    response = asyncio.run(scenario())
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Unknown sections: horoscope"
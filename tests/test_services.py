@@ -0,0 +1,40 @@
+import asyncio
+
+from src.backend.core.services import ServiceRegistry
+
+
+def test_clients_from_a_finished_loop_are_closed_when_replaced():
+    registry = ServiceRegistry()
+
+    async def build():
+        return registry.http(), registry.openai()
+
+    # Two asyncio.run() calls, the first one without aclose()
+    old_http, old_openai = asyncio.run(build())
+
+    async def rebuild():
+        clients = registry.http(), registry.openai()
+        await asyncio.sleep(0)
+        closed = old_http.closed, old_openai.is_closed()
+        await registry.aclose()
+        return clients, closed
+
+    (new_http, new_openai), closed = asyncio.run(rebuild())
+
+    assert new_http is not old_http and new_openai is not old_openai
+    assert closed == (True, True)
+    assert new_http.closed and new_openai.is_closed()
+    assert not registry._closing
+
+
+def test_aclose_closes_clients_from_another_loop():
+    registry = ServiceRegistry()
+
+    async def build():
+        return registry.http()
+
+    http = asyncio.run(build())
+    asyncio.run(registry.aclose())
+
+    assert http.closed
+    assert registry._http is None
@@ -0,0 +1,177 @@
+import asyncio
+import os
+import time
+
+import httpx
+import numpy as np
+import pytest
+
+from src.backend.services import sky_index
+from src.backend.services.sky_index import (
+    SkyIndex,
+    SkyIndexStore,
+    parse_coordinates,
+    radec_to_vectors,
+)
+
+
+def _random_index(n: int = 5000, seed: int = 0) -> SkyIndex:
+    rng = np.random.default_rng(seed)
+    ra = rng.uniform(0, 360, n)
+    # Uniform on the sphere, so the poles get their share of stars
+    dec = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    names = np.array([f"star{i}" for i in range(n)], dtype=object)
+    return SkyIndex(names, ra, dec, rng.uniform(-1, 6, n), bands=16)
+
+
+def _brute_force(index: SkyIndex, ra: float, dec: float, radius: float) -> set:
+    cosines = index.vectors @ radec_to_vectors(ra, dec)[0]
+    separations = np.degrees(np.arccos(np.clip(cosines, -1.0, 1.0)))
+    return set(np.flatnonzero(separations <= radius))
+
+
+def test_parse_coordinates():
+    ra, dec = parse_coordinates("16 29 24.460 -26 25 55.21")
+    assert ra == pytest.approx(247.35192, abs=1e-5)
+    assert dec == pytest.approx(-26.43200, abs=1e-5)
+    assert parse_coordinates("not a position") is None
+    assert parse_coordinates(None) is None
+
+
+@pytest.mark.parametrize(
+    "ra, dec, radius",
+    [
+        (10.0, 20.0, 5.0),
+        (359.5, 0.0, 3.0),  # wraps around RA 0
+        (120.0, 88.0, 4.0),  # covers the north pole
+        (200.0, -89.0, 2.0),  # covers the south pole
+        (45.0, 60.0, 35.0),  # wide cone at high declination
+        (0.0, 0.0, 180.0),  # whole sky
+    ],
+)
+def test_cone_search_matches_brute_force(ra, dec, radius):
+    index = _random_index()
+
+    indices, separations = index.cone_search(ra, dec, radius)
+
+    assert set(indices) == _brute_force(index, ra, dec, radius)
+    assert np.all(np.diff(separations) >= 0)
+    assert np.all(separations <= radius + 1e-9)
+
+
+def test_cone_search_many_matches_single_searches():
+    index = _random_index()
+    ra, dec = [10.0, 359.5, 120.0], [20.0, 0.0, 88.0]
+
+    results = index.cone_search_many(ra, dec, 5.0)
+
+    for (indices, _), point in zip(results, zip(ra, dec)):
+        assert set(indices) == set(index.cone_search(*point, 5.0)[0])
+
+
+def test_store_reloads_when_the_file_is_replaced(tmp_path):
+    path = str(tmp_path / "sky.npz")
+    _random_index(100, seed=1).save(path)
+    store = SkyIndexStore(path)
+
+    first = asyncio.run(store.get())
+    assert len(first) == 100
+
+    # Another process (the update flow) rebuilds the file
+    _random_index(150, seed=2).save(path)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+
+    assert len(asyncio.run(store.get())) == 150
+
+
+def test_store_does_not_persist_an_empty_index(tmp_path, monkeypatch):
+    path = str(tmp_path / "sky.npz")
+    empty = _random_index(0)
+
+    async def build():
+        return empty
+
+    monkeypatch.setattr(sky_index, "build_sky_index", build)
+    store = SkyIndexStore(path)
+
+    assert len(asyncio.run(store.get())) == 0
+    assert not os.path.exists(path)
+
+
+def test_added_stars_are_searchable_before_a_rebuild(tmp_path, monkeypatch):
+    path = str(tmp_path / "sky.npz")
+    _random_index(100, seed=1).save(path)
+    catalog = _random_index(100, seed=1)
+    rebuilds = []
+
+    async def build():
+        rebuilds.append(True)
+        return catalog.with_stars([("alf Lyr", 279.23, 38.78, 0.03)])
+
+    monkeypatch.setattr(sky_index, "build_sky_index", build)
+    monkeypatch.setattr(sky_index, "REBUILD_INTERVAL", 3600)
+    store = SkyIndexStore(path)
+    asyncio.run(store.get())
+
+    store.add("alf Lyr", 279.23, 38.78, 0.03)
+    assert store.index.position("alf Lyr") == (279.23, 38.78)
+
+    # Loaded from file, so the first get() after an add rebuilds and persists
+    index = asyncio.run(store.get())
+    assert len(index) == 101 and rebuilds == [True]
+    assert SkyIndex.load(path).position("alf Lyr") is not None
+
+    # Later additions wait for the interval but are served from memory
+    store.add("alf Cyg", 310.36, 45.28, 1.25)
+    index = asyncio.run(store.get())
+    assert index.position("alf Cyg") is not None and rebuilds == [True]
+
+
+def test_rebuild_keeps_stars_added_while_reading_the_catalog(tmp_path, monkeypatch):
+    store = SkyIndexStore(str(tmp_path / "sky.npz"))
+
+    async def build():
+        # Stored by a request while the catalog query was running
+        store.add("alf Lyr", 279.23, 38.78, 0.03)
+        return _random_index(10)
+
+    monkeypatch.setattr(sky_index, "build_sky_index", build)
+
+    index = asyncio.run(store.get())
+
+    assert index.position("alf Lyr") is not None
+    assert store._added == [("alf Lyr", 279.23, 38.78, 0.03)]
+
+
+def test_cone_search_resolves_names_like_star_info(tmp_path, monkeypatch):
+    from src.backend.routes import sky
+
+    store = SkyIndexStore(str(tmp_path / "sky.npz"))
+    store.index = _random_index(100).with_stars([("alf Lyr", 279.23, 38.78, 0.03)])
+    store._built_at = time.monotonic()
+    monkeypatch.setattr(sky, "sky_index_store", store)
+
+    async def fetch_star_data(star_name, refresh=False):
+        if star_name == "Vega":
+            return {"name": "alf Lyr"}
+        return {"error": f"Star '{star_name}' not found in SIMBAD."}
+
+    monkeypatch.setattr(sky, "fetch_star_data", fetch_star_data)
+
+    async def scenario():
+        from src.backend.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            found = await c.get("/sky/cone", params={"star_name": "Vega", "radius": 1})
+            missing = await c.get(
+                "/sky/cone", params={"star_name": "Nope", "radius": 1}
+            )
+        return found, missing
+
+    found, missing = asyncio.run(scenario())
+
+    assert found.status_code == 200
+    assert found.json()["center"] == {"ra": 279.23, "dec": 38.78}
+    assert found.json()["stars"][0]["name"] == "alf Lyr"
+    assert missing.status_code == 404
@@ -0,0 +1,160 @@
+import asyncio
+import csv
+import io
+import json
+
+import httpx
+import pyarrow as pa
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.backend.core.services import services
+from src.backend.models.star import Base, Star
+
+MYTHOLOGY = {"version": 1, "sections": {"mythological_meaning": "The harp star."}}
+
+STARS = [
+    {"name": "alf Lyr", "spectral_type": "A0Va", "magnitude": 0.03, "distance": 25.0},
+    {"name": "alf Sco", "spectral_type": "M1.5Iab", "magnitude": 1.06, "distance": 550},
+    {"name": "bet Ori", "spectral_type": "B8Ia", "magnitude": 0.13, "distance": 860},
+    {"name": "alf Cen A", "spectral_type": "G2V", "magnitude": -0.01, "distance": 4.37},
+    {"name": "alf Tau", "spectral_type": "K5III", "magnitude": 0.86, "distance": 65.0},
+    {"name": "eps Eri", "spectral_type": "K2V", "magnitude": 3.73, "distance": 10.5},
+]
+
+
+def _export(tmp_path, monkeypatch, *requests: dict) -> list[httpx.Response]:
+    """Runs GET /stars with each params dict against a seeded SQLite catalog."""
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stars.db'}")
+        monkeypatch.setattr(services, "_engine", engine)
+        monkeypatch.setattr(services, "_session_factory", None)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with services.session_factory()() as session:
+            session.add_all(
+                Star(id=i, mythology=MYTHOLOGY if i == 1 else None, **star)
+                for i, star in enumerate(STARS, start=1)
+            )
+            await session.commit()
+
+        from src.backend.main import app
+
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+                return [await c.get("/stars", params=params) for params in requests]
+        finally:
+            await services.aclose()
+
+    return asyncio.run(scenario())
+
+
+def _rows(response: httpx.Response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_keyset_pages_chain_through_the_last_id(tmp_path, monkeypatch):
+    first, second, last = _export(
+        tmp_path,
+        monkeypatch,
+        {"limit": 4},
+        {"limit": 4, "after_id": 4},
+        {"limit": 4, "after_id": 6},
+    )
+
+    page = _rows(first)
+    assert [row["id"] for row in page] == [1, 2, 3, 4]
+    # The last row's id is the cursor for the next page
+    assert page[-1]["id"] == 4
+    assert [row["id"] for row in _rows(second)] == [5, 6]
+    assert last.status_code == 200 and last.text == ""
+
+
+def test_fields_are_projected_and_validated(tmp_path, monkeypatch):
+    projected, unknown = _export(
+        tmp_path,
+        monkeypatch,
+        {"fields": "name, magnitude", "limit": 2},
+        {"fields": "name,luminosity"},
+    )
+
+    assert _rows(projected) == [
+        {"id": 1, "name": "alf Lyr", "magnitude": 0.03},
+        {"id": 2, "name": "alf Sco", "magnitude": 1.06},
+    ]
+    assert unknown.status_code == 422
+    assert unknown.json()["detail"] == "Unknown fields: luminosity"
+
+
+def test_mythology_is_only_exported_when_requested(tmp_path, monkeypatch):
+    default, requested = _export(
+        tmp_path,
+        monkeypatch,
+        {"limit": 1},
+        {"fields": "name,mythology", "limit": 1},
+    )
+
+    [row] = _rows(default)
+    assert "mythology" not in row and row["name"] == "alf Lyr"
+    assert _rows(requested) == [{"id": 1, "name": "alf Lyr", "mythology": MYTHOLOGY}]
+
+
+def test_spectral_magnitude_and_distance_filters(tmp_path, monkeypatch):
+    spectral, magnitude, distance, combined = _export(
+        tmp_path,
+        monkeypatch,
+        {"spectral_class": "k", "fields": "name"},
+        {"min_magnitude": 0.1, "max_magnitude": 1.0, "fields": "name"},
+        {"min_distance": 10, "max_distance": 100, "fields": "name"},
+        {"spectral_class": "K", "max_distance": 20, "fields": "name"},
+    )
+
+    def names(response):
+        return [row["name"] for row in _rows(response)]
+
+    assert names(spectral) == ["alf Tau", "eps Eri"]
+    assert names(magnitude) == ["bet Ori", "alf Tau"]
+    assert names(distance) == ["alf Lyr", "alf Tau", "eps Eri"]
+    assert names(combined) == ["eps Eri"]
+
+
+def test_csv_export(tmp_path, monkeypatch):
+    [response] = _export(
+        tmp_path, monkeypatch, {"format": "csv", "fields": "name,mythology,distance"}
+    )
+
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert list(rows[0]) == ["id", "name", "mythology", "distance"]
+    assert len(rows) == len(STARS)
+    assert json.loads(rows[0]["mythology"]) == MYTHOLOGY
+    assert rows[1] == {
+        "id": "2",
+        "name": "alf Sco",
+        "mythology": "",
+        "distance": "550.0",
+    }
+
+
+def test_arrow_export_reads_back_as_an_ipc_stream(tmp_path, monkeypatch):
+    [response] = _export(
+        tmp_path,
+        monkeypatch,
+        {"format": "arrow", "fields": "name,magnitude,mythology"},
+    )
+
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.schema == pa.schema(
+        [
+            ("id", pa.int64()),
+            ("name", pa.string()),
+            ("magnitude", pa.float64()),
+            ("mythology", pa.string()),
+        ]
+    )
+    assert table.column("id").to_pylist() == [1, 2, 3, 4, 5, 6]
+    assert table.column("magnitude").to_pylist()[:2] == [0.03, 1.06]
+    assert json.loads(table.column("mythology")[0].as_py()) == MYTHOLOGY
+    assert table.column("mythology")[1].as_py() is None
@@ -0,0 +1,22 @@
+import argparse
+import os
+
+import pytest
+
+from benchmarks import bench_startup
+
+# Fewer runs than the benchmark's default; the median is still stable enough
+STARTUP_TEST_RUNS = int(os.getenv("STARTUP_TEST_RUNS", "3"))
+
+
+@pytest.mark.startup
+def test_app_import_stays_within_budget_and_lazy():
+    args = argparse.Namespace(
+        runs=STARTUP_TEST_RUNS,
+        budget_ms=float(os.getenv("STARTUP_BUDGET_MS", "1200")),
+        forbid=list(bench_startup.LAZY_MODULES),
+    )
+
+    results, failures = bench_startup.run(args)
+
+    assert failures == [], (failures, results["import_profile_ms"])
@@ -0,0 +1,192 @@
+import asyncio
+import contextvars
+import json
+import os
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import Headers, QueryParams
+
+from src.backend import main
+from src.backend.core import profiler, tracing
+from src.backend.core.profiler import SamplingProfiler, profiling_requested
+
+BODY_DELAY = 0.2
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(main.trace_request)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            yield b"first,"
+            await asyncio.sleep(BODY_DELAY)
+            yield b"last"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+def _get(path: str, **kwargs) -> httpx.Response:
+    async def request():
+        transport = httpx.ASGITransport(app=_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            response = await c.get(path, **kwargs)
+        # Exports run in the default executor
+        await asyncio.sleep(0.05)
+        return response
+
+    return asyncio.run(request())
+
+
+def test_root_span_covers_the_streamed_body(monkeypatch):
+    exported = []
+    monkeypatch.setattr(tracing, "TRACE_EXPORT", "json")
+    monkeypatch.setattr(
+        tracing, "export_trace", lambda trace, fmt: exported.append(trace)
+    )
+
+    response = _get("/stream")
+
+    assert response.text == "first,last"
+    [trace] = exported
+    assert response.headers["X-Trace-Id"] == trace.trace_id
+    assert trace.root.name == "GET /stream"
+    assert trace.root.attributes["http.status_code"] == 200
+    assert trace.duration >= BODY_DELAY
+
+
+def test_no_trace_without_exporter_or_profile(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_EXPORT", "")
+    started = []
+    monkeypatch.setattr(tracing, "start_trace", lambda *a, **k: started.append(a))
+
+    response = _get("/stream")
+
+    assert response.status_code == 200
+    assert "X-Trace-Id" not in response.headers
+    assert started == []
+
+
+def _busy_wait(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampling_profiler_collapses_stacks():
+    with SamplingProfiler(interval=0.001) as sampler:
+        _busy_wait(0.1)
+
+    assert sampler.sample_count > 0
+    assert sampler.elapsed >= 0.1
+    lines = sampler.collapsed().splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) == max(sampler.samples.values())
+    assert "_busy_wait (test_tracing.py:" in stack
+    assert stack.split(";")[-1].startswith("_busy_wait")
+
+
+@pytest.mark.parametrize(
+    "token, headers, query, expected",
+    [
+        ("", {"X-Debug-Profile": ""}, {}, False),  # disabled without a token
+        ("s3cret", {}, {}, False),
+        ("s3cret", {"X-Debug-Profile": "wrong"}, {}, False),
+        ("s3cret", {}, {"debug_profile": "s3cre"}, False),
+        ("s3cret", {"X-Debug-Profile": "s3cret"}, {}, True),
+        ("s3cret", {}, {"debug_profile": "s3cret"}, True),
+    ],
+)
+def test_profiling_requires_the_configured_token(
+    monkeypatch, token, headers, query, expected
+):
+    monkeypatch.setattr(profiler, "DEBUG_PROFILE_TOKEN", token)
+
+    assert profiling_requested(Headers(headers), QueryParams(query)) is expected
+
+
+def test_profiled_request_returns_the_profile_without_writing_a_trace(monkeypatch):
+    exported = []
+    monkeypatch.setattr(tracing, "TRACE_EXPORT", "")
+    monkeypatch.setattr(tracing, "export_trace", lambda *args: exported.append(args))
+    monkeypatch.setattr(profiler, "DEBUG_PROFILE_TOKEN", "s3cret")
+
+    profiled = _get("/stream", headers={"X-Debug-Profile": "s3cret"})
+    wrong = _get("/stream", headers={"X-Debug-Profile": "guess"})
+
+    assert profiled.headers["X-Original-Status"] == "200"
+    assert profiled.headers["content-type"].startswith("text/plain")
+    assert "X-Trace-Id" not in profiled.headers
+    assert exported == []
+    assert wrong.text == "first,last"
+    assert "X-Original-Status" not in wrong.headers
+
+
+def _finished_trace() -> tracing.Trace:
+    def record():
+        trace = tracing.start_trace("GET /star_info/", route="/star_info/")
+        with tracing.span("redis.get", key="star:Vega", hit=False):
+            pass
+        with pytest.raises(TimeoutError), tracing.span("simbad.sim-script"):
+            raise TimeoutError("SIMBAD timed out")
+        trace.root.set_attribute("http.status_code", 200)
+        trace.root.end()
+        return trace
+
+    # Keeps the trace out of this thread's context
+    return contextvars.copy_context().run(record)
+
+
+def test_otlp_export_shape(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_DIR", str(tmp_path))
+    trace = _finished_trace()
+
+    path = tracing.export_trace(trace, "otlp")
+
+    assert os.path.basename(path) == f"{trace.trace_id}.otlp.json"
+    with open(path, encoding="utf-8") as f:
+        [resource_spans] = json.load(f)["resourceSpans"]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": tracing.SERVICE_NAME}}
+    ]
+    [scope_spans] = resource_spans["scopeSpans"]
+    root, redis, simbad = scope_spans["spans"]
+
+    assert {span["traceId"] for span in (root, redis, simbad)} == {trace.trace_id}
+    assert root["kind"] == 2 and "parentSpanId" not in root
+    assert redis["kind"] == 1 and redis["parentSpanId"] == root["spanId"]
+    assert {"key": "http.status_code", "value": {"intValue": "200"}} in root[
+        "attributes"
+    ]
+    assert redis["attributes"] == [
+        {"key": "key", "value": {"stringValue": "star:Vega"}},
+        {"key": "hit", "value": {"boolValue": False}},
+    ]
+    assert redis["status"] == {"code": 1}
+    assert simbad["status"] == {"code": 2, "message": "TimeoutError: SIMBAD timed out"}
+    assert int(root["startTimeUnixNano"]) <= int(redis["startTimeUnixNano"])
+    assert int(simbad["endTimeUnixNano"]) <= int(root["endTimeUnixNano"])
+
+
+def test_json_export_is_named_after_the_trace(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_DIR", str(tmp_path))
+    trace = _finished_trace()
+
+    path = tracing.export_trace(trace, "json")
+
+    assert os.path.basename(path) == f"{trace.trace_id}.json"
+    with open(path, encoding="utf-8") as f:
+        waterfall = json.load(f)
+    assert [span["name"] for span in waterfall["spans"]] == [
+        "GET /star_info/",
+        "redis.get",
+        "simbad.sim-script",
+    ]
+    assert tracing.export_trace(trace, "") is None